@@ -0,0 +1,119 @@
+"""Allocations and decoding time of the paths of large lists.
+
+Every item decoded carries the path of its value for error messages. The items of a
+list used to get a path f-string each (f"{path}[]", built by __parse for every
+element), they now share one linked tuple rendered when an error surfaces. Large
+List[int] and List[dataclass] values are decoded by dataconf's decoders with three
+list decoders over the same item decoders:
+
+- f-string: one f-string path per item, as __parse used to build them,
+- linked: one (path, "[]", "") tuple shared by the items, as decode_list does,
+- dataconf: the compiled List decoder itself (numbers are converted in bulk).
+
+tracemalloc only reports live blocks, the f-string paths are thus kept until the
+snapshot to count every block and byte the decode allocated for them.
+
+Usage: python benchmarks/decode_paths.py [items]
+"""
+
+from dataclasses import dataclass
+import sys
+import time
+import tracemalloc
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Type
+
+from dataconf import utils
+
+# paths of lists nested deep in a config
+PATH = ".regions.europe-west.clusters.primary.pools"
+
+
+@dataclass
+class Pool:
+    name: str
+    weight: int
+    labels: Dict[str, str]
+
+
+def fstring(clazz: Type, paths: Optional[List[str]] = None) -> Callable:
+    item = utils.compile_decoder(clazz)
+
+    def decode(value, path, ctx):
+        prefix = utils.path_to_str(path)
+        ret = []
+        for v in value:
+            item_path = f"{prefix}[]"
+            if paths is not None:
+                paths.append(item_path)
+            ret.append(item(v, item_path, ctx))
+        return ret
+
+    return decode
+
+
+def linked(clazz: Type, paths: Optional[List[str]] = None) -> Callable:
+    item = utils.compile_decoder(clazz)
+
+    def decode(value, path, ctx):
+        item_path = (path, "[]", "")
+        return [item(v, item_path, ctx) for v in value]
+
+    return decode
+
+
+def compiled(clazz: Type, paths: Optional[List[str]] = None) -> Callable:
+    return utils.compile_decoder(List[clazz])
+
+
+def allocated(decoder: Callable, value: Any) -> tuple:
+    ctx = utils.ParseContext()
+    tracemalloc.start()
+    decoded = decoder(value, PATH, ctx)
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del decoded
+    stats = snapshot.statistics("filename")
+    return sum(s.count for s in stats), sum(s.size for s in stats)
+
+
+def timed(decoder: Callable, value: Any) -> float:
+    ctx = utils.ParseContext()
+    times = []
+    for _ in range(10):
+        start = time.perf_counter()
+        decoder(value, PATH, ctx)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    values = {
+        int: list(range(items)),
+        Pool: [
+            {"name": f"pool-{i}", "weight": i, "labels": {"zone": f"z{i % 3}"}}
+            for i in range(items)
+        ],
+    }
+
+    for clazz, value in values.items():
+        for name, variant in (
+            ("f-string", fstring),
+            ("linked", linked),
+            ("dataconf", compiled),
+        ):
+            blocks, size = allocated(variant(clazz, []), value)
+            best = timed(variant(clazz), value)
+            print(
+                f"List[{clazz.__name__}] items={items} {name:<8} blocks={blocks} "
+                f"size={size / 2**20:6.2f} MiB best={best * 1000:8.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Import time of dataconf, its backends being imported lazily on first use.
+
+Usage: python benchmarks/import_time.py [runs]
+"""
+
+import statistics
+import subprocess
+import sys
+
+TIMED = "import time; t = time.perf_counter(); {}; print(time.perf_counter() - t)"
+
+CASES = {
+    "import dataconf": "import dataconf",
+    "import dataconf + backends (eager baseline)": "import dataconf, pyhocon, yaml, dateutil.parser, isodate",
+}
+
+
+def measure(statement: str, runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", TIMED.format(statement)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        times.append(float(out.stdout))
+    return statistics.median(times)
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    results = {name: measure(statement, runs) for name, statement in CASES.items()}
+    for name, seconds in results.items():
+        print(f"{name:<45} {seconds * 1000:8.2f} ms")
+
+    lazy, eager = results.values()
+    print(f"{'speedup':<45} {eager / lazy:8.2f} x")
+    if lazy >= eager:
+        sys.exit("lazy import is not faster than importing the backends")
+
+
+if __name__ == "__main__":
+    main()
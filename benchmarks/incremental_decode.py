@@ -0,0 +1,86 @@
+"""Decoding time of a large config reloaded after one of its keys changed.
+
+Each reload parses the config again from scratch, with a DecodeMemo the frozen
+dataclasses of unchanged subtrees are reused from the previous decode.
+
+Usage: python benchmarks/incremental_decode.py [services]
+"""
+
+from dataclasses import dataclass
+import copy
+import sys
+import time
+from typing import Dict
+from typing import List
+
+import dataconf
+
+
+@dataclass(frozen=True)
+class Limits:
+    cpu: int
+    memory: int
+
+
+@dataclass(frozen=True)
+class Port:
+    name: str
+    port: int
+
+
+@dataclass(frozen=True)
+class Service:
+    image: str
+    replicas: int
+    limits: Limits
+    ports: List[Port]
+    env: Dict[str, str]
+
+
+@dataclass(frozen=True)
+class Config:
+    services: Dict[str, Service]
+
+
+def generate(services: int) -> dict:
+    return {
+        "services": {
+            f"svc{i}": {
+                "image": f"registry/svc{i}:1",
+                "replicas": 1 + i % 3,
+                "limits": {"cpu": 1, "memory": 512},
+                "ports": [
+                    {"name": "http", "port": 8000 + i},
+                    {"name": "admin", "port": 9000},
+                ],
+                "env": {f"VAR{j}": str(j) for j in range(5)},
+            }
+            for i in range(services)
+        }
+    }
+
+
+def measure(data: dict, memo) -> float:
+    times = []
+    for reload in range(10):
+        # reloaded configs are new objects, one replica count changes each time
+        conf = copy.deepcopy(data)
+        conf["services"]["svc0"]["replicas"] = reload
+        start = time.perf_counter()
+        dataconf.parse(conf, Config, memo=memo)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    services = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    data = generate(services)
+    for memo in (None, dataconf.DecodeMemo()):
+        elapsed = measure(data, memo)
+        print(
+            f"services={services} memo={memo is not None!s:<5} best={elapsed * 1000:8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
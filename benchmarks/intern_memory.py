@@ -0,0 +1,76 @@
+"""Resident memory of many decoded job configs with repeated values, against intern=True.
+
+The configs are parsed from JSON so every value is a distinct object, the memory still
+allocated once the decode returned (i.e. held by the decoded configs, the parsed document
+is released by then) is traced with tracemalloc.
+
+Usage: python benchmarks/intern_memory.py [jobs]
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timedelta
+import gc
+import json
+from pathlib import Path
+import sys
+import tracemalloc
+from typing import Dict
+from typing import List
+
+import dataconf
+
+
+@dataclass
+class Job:
+    owner: str
+    region: str
+    workdir: Path
+    start: datetime
+    every: timedelta
+    labels: Dict[str, str]
+    tags: List[str]
+
+
+def generate(jobs: int) -> str:
+    return json.dumps(
+        {
+            f"job-{i}": {
+                "owner": f"team-{i % 10}",
+                "region": "eu-west-1",
+                "workdir": f"/srv/jobs/team-{i % 10}",
+                "start": "2024-01-01T00:00:00+00:00",
+                "every": "PT1H",
+                "labels": {"tier": "gold", "env": "production"},
+                "tags": ["batch", "nightly"],
+            }
+            for i in range(jobs)
+        }
+    )
+
+
+def measure(jobs: int, intern: bool) -> None:
+    data = generate(jobs)
+    loader = dataconf.compile(Dict[str, Job])
+    loader.string(generate(1), loader=dataconf.JSON, intern=intern)
+    gc.collect()
+    tracemalloc.start()
+    decoded = loader.string(data, loader=dataconf.JSON, intern=intern)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"jobs={jobs} intern={intern!s:<5} "
+        f"retained={retained / 2**20:7.1f} MiB ({retained / jobs:.0f} B/job)"
+    )
+    del decoded
+
+
+def main() -> None:
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    for intern in (False, True):
+        measure(jobs, intern)
+
+
+if __name__ == "__main__":
+    main()
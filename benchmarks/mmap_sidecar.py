@@ -0,0 +1,64 @@
+"""Loading time of a HOCON config holding a large list of floats, inlined or as a sidecar.
+
+The sidecar is a raw float32 file referenced with {"$mmap": file, dtype: float32} and
+decoded into a memoryview mapping it.
+
+Usage: python benchmarks/mmap_sidecar.py [items]
+"""
+
+from array import array
+from dataclasses import dataclass
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+import dataconf
+
+
+@dataclass
+class Inline:
+    weights: List[float]
+
+
+@dataclass
+class Sidecar:
+    weights: memoryview
+
+
+def measure(path: str, clazz: type) -> float:
+    times = []
+    for _ in range(3):
+        start = time.perf_counter()
+        dataconf.file(path, clazz)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    weights = array("f", (i / 7 for i in range(items)))
+    with tempfile.TemporaryDirectory() as tmp:
+        inline = os.path.join(tmp, "inline.hocon")
+        with open(inline, "w") as f:
+            f.write(f"weights = [{', '.join(map(str, weights))}]")
+
+        sidecar = os.path.join(tmp, "sidecar.hocon")
+        with open(os.path.join(tmp, "weights.f32"), "wb") as f:
+            weights.tofile(f)
+        with open(sidecar, "w") as f:
+            f.write(
+                f'weights {{ "$mmap": "{os.path.join(tmp, "weights.f32")}", dtype: float32 }}'
+            )
+
+        for name, path, clazz in (
+            ("inline", inline, Inline),
+            ("sidecar", sidecar, Sidecar),
+        ):
+            elapsed = measure(path, clazz)
+            print(f"items={items} {name:<8} best={elapsed * 1000:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Build and merge time of chains stacking many overlay layers (per region, cluster and host).
+
+Usage: python benchmarks/multi_layers.py [layers]
+"""
+
+from dataclasses import dataclass
+import sys
+import time
+from typing import Dict
+
+import dataconf
+
+
+@dataclass
+class Limits:
+    cpu: int
+    memory: int
+
+
+@dataclass
+class Service:
+    replicas: int
+    image: str
+    limits: Limits
+    env: Dict[str, str]
+
+
+@dataclass
+class Config:
+    services: Dict[str, Service]
+
+
+def base(services: int) -> dict:
+    return {
+        "services": {
+            f"svc{i}": {
+                "replicas": 1,
+                "image": f"registry/svc{i}:1",
+                "limits": {"cpu": 1, "memory": 512},
+                "env": {f"VAR{j}": str(j) for j in range(10)},
+            }
+            for i in range(services)
+        }
+    }
+
+
+def overlay(layer: int, services: int) -> dict:
+    svc = f"svc{layer % services}"
+    return {
+        "services": {
+            svc: {
+                "replicas": layer,
+                "limits": {"cpu": layer % 8 + 1},
+                "env": {f"LAYER{layer}": str(layer)},
+            }
+        }
+    }
+
+
+def measure(layers: int, hocon: bool) -> float:
+    services = 50
+    overlays = [overlay(layer, services) for layer in range(layers)]
+
+    start = time.perf_counter()
+    chain = dataconf.multi.dict(base(services))
+    if hocon:
+        # a HOCON source in the stack makes the merge build ConfigTrees
+        chain = chain.string("services.svc0.image = registry/svc0:2")
+    for conf in overlays:
+        chain = chain.dict(conf)
+    chain.on(Config)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    layers = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    for hocon in (False, True):
+        elapsed = min(measure(layers, hocon) for _ in range(5))
+        print(f"layers={layers} hocon={hocon!s:<5} best={elapsed * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
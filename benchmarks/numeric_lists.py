@@ -0,0 +1,59 @@
+"""Decoding time of a config holding a large list of floats, into each supported target.
+
+The list is parsed from JSON beforehand, only the decode is timed.
+
+Usage: python benchmarks/numeric_lists.py [items]
+"""
+
+from array import array
+from dataclasses import dataclass
+import json
+import sys
+import time
+from typing import Any
+from typing import List
+
+import dataconf
+
+
+@dataclass
+class Embeddings:
+    table: List[float]
+
+
+@dataclass
+class Packed:
+    table: array
+
+
+def measure(conf: dict, clazz: Any) -> float:
+    times = []
+    for _ in range(5):
+        start = time.perf_counter()
+        dataconf.parse(conf, clazz)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    conf = json.loads(json.dumps({"table": [i / 7 for i in range(items)]}))
+    targets = [("List[float]", Embeddings), ("array", Packed)]
+    try:
+        import numpy
+
+        @dataclass
+        class Matrix:
+            table: numpy.ndarray
+
+        targets.append(("numpy.ndarray", Matrix))
+    except ImportError:
+        pass
+
+    for name, clazz in targets:
+        elapsed = measure(conf, clazz)
+        print(f"items={items} {name:<14} best={elapsed * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Decoding time of schedules made of a few repeated datetime, duration and path literals.
+
+Compares the memoized converters (warm, cold after dataconf.cache_clear) against calling
+isoparse, isodate.parse_duration and Path for every value.
+
+Usage: python benchmarks/scalar_converters.py [schedules]
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+import sys
+import time
+from typing import List
+
+from dateutil.parser import isoparse
+from isodate import parse_duration
+
+import dataconf
+from dataconf import utils
+
+
+@dataclass
+class Schedule:
+    name: str
+    start: datetime
+    every: timedelta
+    timeout: timedelta
+    workdir: Path
+
+
+@dataclass
+class Schedules:
+    schedules: List[Schedule]
+
+
+def generate(schedules: int) -> List[dict]:
+    return [
+        {
+            "name": f"job-{i}",
+            "start": f"2024-01-{1 + i % 28:02d}T00:00:00Z",
+            "every": ("PT5M", "PT1H", "P1D")[i % 3],
+            "timeout": "PT30S",
+            "workdir": f"/srv/jobs/{i % 10}",
+        }
+        for i in range(schedules)
+    ]
+
+
+def measure(data: List[dict], clear: bool) -> float:
+    times = []
+    for _ in range(5):
+        if clear:
+            dataconf.cache_clear()
+        start = time.perf_counter()
+        dataconf.dict({"schedules": data}, Schedules)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    schedules = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    data = generate(schedules)
+
+    converters = (utils.parse_datetime, utils.parse_timedelta, utils._parse_path)
+    utils.parse_datetime = isoparse
+    utils.parse_timedelta = parse_duration
+    utils._parse_path = lambda clazz, value: clazz(value)
+    print(
+        f"schedules={schedules} unmemoized best={measure(data, False) * 1000:8.2f} ms"
+    )
+
+    utils.parse_datetime, utils.parse_timedelta, utils._parse_path = converters
+    for clear in (True, False):
+        mode = "cold" if clear else "warm"
+        print(
+            f"schedules={schedules} {mode:<10} best={measure(data, clear) * 1000:8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Resident memory of many decoded tenant configs, plain dataclasses against slots=True.
+
+Each mode runs in its own process, the RSS growth is measured around the decode while
+the decoded configs are kept alive.
+
+Usage: python benchmarks/slots_memory.py [tenants]
+"""
+
+from dataclasses import dataclass
+import gc
+import subprocess
+import sys
+from typing import Dict
+from typing import List
+
+import dataconf
+
+
+@dataclass
+class Limits:
+    cpu: int
+    memory: int
+    storage: int
+
+
+@dataclass
+class Feature:
+    name: str
+    enabled: bool
+
+
+@dataclass
+class TenantConf:
+    name: str
+    region: str
+    tier: str
+    limits: Limits
+    features: List[Feature]
+
+
+def rss() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * 4096
+
+
+def generate(tenants: int) -> dict:
+    return {
+        f"tenant-{i}": {
+            "name": f"tenant-{i}",
+            "region": "eu",
+            "tier": "gold",
+            "limits": {"cpu": 4, "memory": 2048, "storage": 100},
+            "features": [{"name": "sso", "enabled": True}],
+        }
+        for i in range(tenants)
+    }
+
+
+def measure(tenants: int, slots: bool) -> None:
+    data = generate(tenants)
+    loader = dataconf.compile(Dict[str, TenantConf])
+    loader.dict(generate(1), slots=slots)
+    gc.collect()
+    before = rss()
+    decoded = loader.dict(data, slots=slots)
+    gc.collect()
+    after = rss()
+    print(
+        f"tenants={tenants} slots={slots!s:<5} "
+        f"rss={(after - before) / 2**20:7.1f} MiB ({(after - before) / tenants:.0f} B/tenant)"
+    )
+    del decoded
+
+
+def main() -> None:
+    tenants = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    if len(sys.argv) > 2:
+        measure(tenants, sys.argv[2] == "slots")
+        return
+    for mode in ("plain", "slots"):
+        subprocess.run([sys.executable, __file__, str(tenants), mode], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Decoding time of YAML files with the pure Python loader and the libyaml one.
+
+Usage: python benchmarks/yaml_loader.py [routes]
+"""
+
+from dataclasses import dataclass
+from dataclasses import field
+import os
+import sys
+import tempfile
+import timeit
+from typing import Dict
+from typing import List
+
+import dataconf
+import yaml
+
+
+@dataclass
+class Simple:
+    hello: str
+    foo: List[str]
+
+
+@dataclass
+class Backend:
+    host: str
+    port: int
+
+
+@dataclass
+class Route:
+    path: str
+    backends: List[Backend]
+    tags: List[str] = field(default_factory=list)
+
+
+def write_routes(path: str, routes: int) -> None:
+    with open(path, "w") as f:
+        for i in range(routes):
+            f.write(f"route{i}:\n  path: /route/{i}\n  tags: [a, b, c]\n  backends:\n")
+            for j in range(4):
+                f.write(f"    - host: backend{j}.example.com\n      port: {8000 + j}\n")
+
+
+def measure(path: str, clazz, number: int) -> None:
+    pure = timeit.timeit(
+        lambda: dataconf.load(path, clazz, pure_yaml=True), number=number
+    )
+    libyaml = timeit.timeit(lambda: dataconf.load(path, clazz), number=number)
+    name = os.path.basename(path)
+    print(f"{name:<12} pure={pure / number * 1000:9.2f} ms", end=" ")
+    print(f"libyaml={libyaml / number * 1000:9.2f} ms speedup={pure / libyaml:5.2f} x")
+
+
+def main() -> None:
+    if not hasattr(yaml, "CSafeLoader"):
+        sys.exit("PyYAML was built without libyaml")
+
+    routes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    measure("confs/simple.yaml", Simple, 2000)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "routes.yaml")
+        write_routes(path, routes)
+        measure(path, Dict[str, Route], 3)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Peak memory of decoding a large YAML routing table, with and without streaming.
+
+Usage: python benchmarks/yaml_stream_memory.py [routes]
+"""
+
+from dataclasses import dataclass
+import os
+import sys
+import tempfile
+import tracemalloc
+from typing import Dict
+from typing import List
+
+import dataconf
+
+
+@dataclass
+class Backend:
+    host: str
+    port: int
+
+
+@dataclass
+class Route:
+    path: str
+    timeout_ms: int
+    backends: List[Backend]
+
+
+def generate(path: str, routes: int) -> None:
+    with open(path, "w") as f:
+        for i in range(routes):
+            f.write(f"route-{i}:\n  path: /service/{i}\n  timeout_ms: {i % 1000}\n")
+            f.write("  backends:\n")
+            for j in range(3):
+                f.write(f"    - host: host-{i}-{j}.internal\n      port: {8000 + j}\n")
+
+
+def measure(path: str, stream: bool) -> None:
+    tracemalloc.start()
+    result = dataconf.load(path, Dict[str, Route], stream=stream)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"stream={stream!s:<5} routes={len(result)} peak={peak / 2**20:7.1f} MiB")
+
+
+def main() -> None:
+    routes = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    fd, path = tempfile.mkstemp(suffix=".yaml")
+    os.close(fd)
+    try:
+        generate(path, routes)
+        print(f"{os.path.getsize(path) / 2**20:.1f} MiB of YAML")
+        measure(path, stream=False)
+        measure(path, stream=True)
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,33 @@
+from dataconf.cache import cache_clear
+from dataconf.cache import cache_info
+from dataconf.cache import url_cache_info
 from dataconf.main import cli
+from dataconf.main import compile
 from dataconf.main import dict
 from dataconf.main import dump
 from dataconf.main import dumps
 from dataconf.main import env
 from dataconf.main import file
+from dataconf.main import iloads_many
 from dataconf.main import HOCON
+from dataconf.main import JSON
 from dataconf.main import load
 from dataconf.main import loads
+from dataconf.main import loads_many
 from dataconf.main import multi
 from dataconf.main import parse
 from dataconf.main import string
 from dataconf.main import url
 from dataconf.main import YAML
+from dataconf.utils import DecodeMemo
 from dataconf.version import __version__
+from dataconf.watcher import watch
 
 __all__ = [
     "load",
     "loads",
+    "loads_many",
+    "iloads_many",
     "dump",
     "dumps",
     "env",
@@ -27,7 +38,23 @@ __all__ = [
     "cli",
     "multi",
     "parse",
+    "compile",
+    "DecodeMemo",
+    "watch",
+    "cache_info",
+    "cache_clear",
+    "url_cache_info",
     "YAML",
     "HOCON",
+    "JSON",
     "__version__",
 ]
+
+
+def __getattr__(name: str):
+    # the asyncio api is imported on first use, like the parsing backends
+    if name == "aio":
+        import importlib
+
+        return importlib.import_module("dataconf.aio")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,108 @@
+"""Asyncio api, sources are fetched and parsed concurrently in an executor.
+
+The chain wraps dataconf.multi whose sources are only loaded when on() is awaited, so
+that urls, files and the HOCON grammar never block the event loop.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Type
+
+from dataconf import main
+
+
+class Multi:
+    def __init__(self, chain: main.Multi) -> None:
+        self.chain = chain
+
+    def env(self, prefix: str, **kwargs) -> "Multi":
+        return Multi(self.chain.env(prefix, **kwargs))
+
+    def dict(self, obj: Dict[str, Any], **kwargs) -> "Multi":
+        return Multi(self.chain.dict(obj, **kwargs))
+
+    def string(self, s: str, **kwargs) -> "Multi":
+        return Multi(self.chain.string(s, **kwargs))
+
+    def url(self, uri: str, **kwargs) -> "Multi":
+        return Multi(self.chain.url(uri, **kwargs))
+
+    def file(self, path: str, **kwargs) -> "Multi":
+        return Multi(self.chain.file(path, **kwargs))
+
+    def cli(self, argv: List[str], **kwargs) -> "Multi":
+        return Multi(self.chain.cli(argv, **kwargs))
+
+    async def load(self, executor: Optional[Executor] = None) -> List[Any]:
+        """Fetch and parse the pending sources concurrently on executor."""
+        loop = asyncio.get_running_loop()
+        chain = self.chain
+
+        async def resolve(conf):
+            if isinstance(conf, main.Source):
+                return await loop.run_in_executor(executor, conf)
+            return conf
+
+        chain.confs = list(await asyncio.gather(*map(resolve, chain.confs)))
+        return chain.confs
+
+    async def on(self, clazz: Type, executor: Optional[Executor] = None):
+        await self.load(executor)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.chain.on, clazz)
+
+
+multi = Multi(main.multi)
+
+
+async def env(prefix: str, clazz: Type, executor: Optional[Executor] = None, **kwargs):
+    return await multi.env(prefix, **kwargs).on(clazz, executor)
+
+
+async def dict(
+    obj: Dict[str, Any], clazz: Type, executor: Optional[Executor] = None, **kwargs
+):
+    return await multi.dict(obj, **kwargs).on(clazz, executor)
+
+
+async def string(s: str, clazz: Type, executor: Optional[Executor] = None, **kwargs):
+    return await multi.string(s, **kwargs).on(clazz, executor)
+
+
+async def url(uri: str, clazz: Type, executor: Optional[Executor] = None, **kwargs):
+    return await multi.url(uri, **kwargs).on(clazz, executor)
+
+
+async def file(
+    path: str,
+    clazz: Type,
+    stream: bool = False,
+    executor: Optional[Executor] = None,
+    **kwargs,
+):
+    if stream:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, partial(main.file, path, clazz, stream=True, **kwargs)
+        )
+
+    return await multi.file(path, **kwargs).on(clazz, executor)
+
+
+async def cli(
+    argv: List[str], clazz: Type, executor: Optional[Executor] = None, **kwargs
+):
+    return await multi.cli(argv, **kwargs).on(clazz, executor)
+
+
+async def load(path: str, clazz: Type, **kwargs):
+    return await file(path, clazz, **kwargs)
+
+
+async def loads(s: str, clazz: Type, **kwargs):
+    return await string(s, clazz, **kwargs)
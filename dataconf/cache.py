@@ -0,0 +1,233 @@
+from collections import namedtuple
+from collections import OrderedDict
+import os
+import re
+from threading import Lock
+from typing import Any
+from typing import Callable
+from typing import Hashable
+from typing import Optional
+from typing import Tuple
+
+from dataconf import utils
+from dataconf.version import __version__
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class ParseCache:
+    """Bounded LRU cache of parsed configs.
+
+    Cached configs are shared between calls and must not be mutated.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def lookup(self, key: Hashable, parse: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+
+        # parsing is done outside of the lock, concurrent misses may parse twice
+        conf = parse()
+
+        with self._lock:
+            self._entries[key] = conf
+            self._entries.move_to_end(key)
+            while len(self._entries) > max(self.maxsize, 0):
+                self._entries.popitem(last=False)
+
+        return conf
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class UrlCache:
+    """Bounded LRU cache of parsed remote configs, revalidated on every fetch.
+
+    Entries are kept for responses carrying an ETag or Last-Modified validator, later
+    fetches send them back with If-None-Match and If-Modified-Since, and a 304 Not
+    Modified returns the cached config without downloading or parsing it again.
+    Cached configs are shared between calls and must not be mutated.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def lookup(self, uri: str, timeout: float, parse: Callable[[bytes], Any]) -> Any:
+        from dataconf.remote import pool
+
+        with self._lock:
+            entry = self._entries.get(uri)
+
+        headers = {}
+        if entry is not None:
+            etag, modified, _ = entry
+            if etag is not None:
+                headers["If-None-Match"] = etag
+            if modified is not None:
+                headers["If-Modified-Since"] = modified
+
+        response = pool.get(uri, headers, timeout)
+        if response.status == 304 and entry is not None:
+            with self._lock:
+                self.hits += 1
+                if uri in self._entries:
+                    self._entries.move_to_end(uri)
+            return entry[2]
+
+        with self._lock:
+            self.misses += 1
+
+        conf = parse(response.body)
+        etag = response.headers.get("ETag")
+        modified = response.headers.get("Last-Modified")
+
+        with self._lock:
+            if etag is None and modified is None:
+                self._entries.pop(uri, None)
+                return conf
+            self._entries[uri] = (etag, modified, conf)
+            self._entries.move_to_end(uri)
+            while len(self._entries) > max(self.maxsize, 0):
+                self._entries.popitem(last=False)
+
+        return conf
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def file_key(path: str, loader: Optional[int]) -> Tuple[str, int, int, Optional[int]]:
+    """Key identifying a file version, changes whenever the file is modified."""
+    stat = os.stat(path)
+    return (os.path.realpath(path), stat.st_mtime_ns, stat.st_size, loader)
+
+
+class DiskCache:
+    """Persistent cache of resolved HOCON files, stored as pickled plain values.
+
+    Entries are keyed by the file content, the environment variables its substitutions
+    may fall back to, and the dataconf and pyhocon versions. Files with includes are
+    never cached as their content hash does not cover the included files. Only point
+    it to a directory that is not writable by untrusted users as entries are unpickled.
+    """
+
+    INCLUDE = re.compile(rb"\binclude\b", re.IGNORECASE)
+    SUBSTITUTION = re.compile(rb"\$\{\??\s*([^}\s]+)\s*\}")
+
+    def __init__(self, directory: str) -> None:
+        # only imported when the disk cache is used
+        import importlib.metadata
+
+        self.directory = directory
+        self.salt = f"\0{__version__}\0{importlib.metadata.version('pyhocon')}".encode()
+
+    def key(self, content: bytes) -> Optional[str]:
+        import hashlib
+
+        if self.INCLUDE.search(content):
+            return None
+
+        digest = hashlib.sha256(content)
+        for name in sorted(set(self.SUBSTITUTION.findall(content))):
+            value = os.environ.get(name.decode("utf-8"))
+            digest.update(b"\0" + name + b"=" + repr(value).encode("utf-8"))
+        digest.update(self.salt)
+        return digest.hexdigest()
+
+    def lookup(self, path: str, parse: Callable[[], Any]) -> Any:
+        import pickle
+
+        with open(path, "rb") as f:
+            content = f.read()
+
+        key = self.key(content)
+        if key is None:
+            return parse()
+
+        entry = os.path.join(self.directory, f"{key}.pickle")
+        try:
+            with open(entry, "rb") as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+
+        conf = parse()
+        plain = to_plain(conf)
+        if plain is None:
+            return conf
+
+        import tempfile
+
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(plain, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, entry)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+        return plain
+
+
+def to_plain(value: Any) -> Any:
+    """Convert a resolved ConfigTree to plain dicts and lists, None if keys need a tree."""
+
+    def convert(v: Any) -> Any:
+        if isinstance(v, dict):
+            return {k: convert(e) for k, e in v.items()}
+        if isinstance(v, list):
+            return [convert(e) for e in v]
+        return v
+
+    plain = convert(value)
+    # keys with dots or special characters would be split again when merged with HOCON
+    return None if utils.__requires_tree(plain) else plain
+
+
+file_cache = ParseCache()
+url_cache = UrlCache()
+
+
+def cache_info() -> CacheInfo:
+    return file_cache.info()
+
+
+def url_cache_info() -> CacheInfo:
+    return url_cache.info()
+
+
+def cache_clear() -> None:
+    file_cache.clear()
+    url_cache.clear()
+    utils.scalar_cache_clear()
@@ -1,30 +1,63 @@
-import contextlib
+from collections import deque
+from concurrent.futures import Executor
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
 import os
+import sys
 from typing import Any, Optional
+from typing import Callable
+from typing import TYPE_CHECKING
 from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Type
+from typing import Union
 from urllib.parse import urlparse
-from urllib.request import urlopen
 
 from dataconf import utils
+from dataconf.cache import DiskCache
+from dataconf.cache import file_cache
+from dataconf.cache import file_key
+from dataconf.cache import url_cache
 from dataconf.exceptions import MalformedConfigException
-from pyhocon import ConfigFactory
-from pyhocon import HOCONConverter
-from pyhocon.config_parser import ConfigTree
-import pyparsing
-from yaml import safe_load
+
+if TYPE_CHECKING:
+    # pyhocon, yaml and their dependencies are imported on first use
+    from pyhocon.config_tree import ConfigTree
 
 HOCON = 1
 YAML = 2
+JSON = 3
 
 
 def parse(
-    conf: ConfigTree, clazz, strict: bool = True, ignore_unexpected: bool = False
+    conf: "ConfigTree",
+    clazz,
+    strict: bool = True,
+    ignore_unexpected: bool = False,
+    memo: Optional[utils.DecodeMemo] = None,
+    slots: bool = False,
+    intern: bool = False,
 ):
+    return _decode(
+        utils.compile_decoder(clazz),
+        conf,
+        utils.ParseContext(strict, ignore_unexpected, memo, slots, intern),
+    )
+
+
+def _decode(decoder: utils.Decoder, conf: "ConfigTree", ctx: utils.ParseContext):
     try:
-        return utils.__parse(conf, clazz, "", strict, ignore_unexpected)
-    except pyparsing.ParseSyntaxException as e:
+        if ctx.memo is not None:
+            return ctx.memo.decode(decoder, conf, ctx)
+        return decoder(conf, "", ctx)
+    except Exception as e:
+        pyparsing = sys.modules.get("pyparsing")
+        if pyparsing is None or not isinstance(e, pyparsing.ParseSyntaxException):
+            utils.rendered(e)
+            raise
         raise MalformedConfigException(
             f'parsing failure line {e.lineno} character {e.col}, got "{e.line}"'
         )
@@ -38,68 +71,301 @@ def cli_parse(*args, **kwargs):
     return utils.__cli_parse(*args, **kwargs)
 
 
+def requires_tree(*args, **kwargs):
+    return utils.__requires_tree(*args, **kwargs)
+
+
+def merge_configs(*args, **kwargs):
+    return utils.__merge_configs(*args, **kwargs)
+
+
+def _from_dict(obj: Any) -> Union["ConfigTree", Any]:
+    # plain values are kept as is unless their keys need HOCON parsing
+    if not requires_tree(obj):
+        return obj
+
+    from pyhocon import ConfigFactory
+
+    return ConfigFactory.from_dict(obj)
+
+
+def _safe_load(stream, pure_yaml: bool = False) -> Any:
+    from yaml import load
+
+    return load(stream, Loader=utils.yaml_loader(pure_yaml))
+
+
+def _json_loads(s: Union[str, bytes]) -> Any:
+    # orjson is used when installed, JSON keys are kept as is unlike HOCON paths
+    import json
+
+    try:
+        from orjson import loads
+    except ImportError:
+        loads = json.loads
+
+    try:
+        return loads(s)
+    except json.JSONDecodeError as e:
+        raise MalformedConfigException(
+            f"parsing failure line {e.lineno} character {e.colno}, {e.msg}"
+        )
+
+
+def _is_json(path: str, loader: Optional[str]) -> bool:
+    return loader == JSON or (loader is None and path.endswith(".json"))
+
+
+def _is_yaml(path: str, loader: Optional[str]) -> bool:
+    return loader == YAML or (
+        loader is None and (path.endswith(".yaml") or path.endswith(".yml"))
+    )
+
+
+def _stream_file(
+    path: str,
+    clazz: Type,
+    loader: Optional[str] = None,
+    allow_missing: bool = False,
+    **kwargs,
+):
+    from dataconf import streaming
+
+    # documents are decoded while read, never built, cached or memoized as a whole
+    options = {
+        option: kwargs.pop(option, None) for option in ("cache", "cache_dir", "memo")
+    }
+    unsupported = [option for option, value in options.items() if value]
+    if unsupported:
+        raise TypeError(
+            f"stream=True does not support {', '.join(unsupported)}, "
+            "load the file without streaming to use them"
+        )
+
+    if allow_missing and not os.path.exists(path):
+        return streaming.loads("{}", clazz, **kwargs)
+    return streaming.load(path, clazz, **kwargs)
+
+
+def _load_file(
+    path: str,
+    loader: Optional[str],
+    cache_dir: Optional[str] = None,
+    pure_yaml: bool = False,
+) -> Union["ConfigTree", Any]:
+    # relative sidecar files are next to the config
+    base = os.path.dirname(os.path.abspath(path))
+
+    if _is_yaml(path, loader):
+        with open(path, "r") as f:
+            return _from_dict(utils.resolve_sidecars(_safe_load(f, pure_yaml), base))
+
+    if _is_json(path, loader):
+        with open(path, "rb") as f:
+            return utils.resolve_sidecars(_json_loads(f.read()), base)
+
+    from pyhocon import ConfigFactory
+
+    def parse() -> "ConfigTree":
+        return utils.resolve_sidecars(ConfigFactory.parse_file(path), base)
+
+    if cache_dir is not None:
+        return DiskCache(cache_dir).lookup(path, parse)
+
+    return parse()
+
+
+def _load_string(
+    s: Union[str, bytes], loader: str = HOCON, pure_yaml: bool = False
+) -> Union["ConfigTree", Any]:
+    if loader == YAML:
+        return _from_dict(_safe_load(s, pure_yaml))
+
+    if loader == JSON:
+        return _json_loads(s)
+
+    from pyhocon import ConfigFactory
+
+    return ConfigFactory.parse_string(s)
+
+
+def _load_strings(strings: List[Union[str, bytes]], **kwargs) -> List[Any]:
+    return [_load_string(s, **kwargs) for s in strings]
+
+
+def _load_url(
+    uri: str, timeout: int = 10, pure_yaml: bool = False, cache: bool = False
+) -> Union["ConfigTree", Any]:
+    def parse(content: bytes) -> Union["ConfigTree", Any]:
+        path = urlparse(uri).path
+        if path.endswith(".yaml") or path.endswith(".yml"):
+            return _load_string(content.decode("utf-8"), YAML, pure_yaml)
+
+        if path.endswith(".json"):
+            return _load_string(content, JSON)
+
+        from pyhocon import ConfigFactory
+
+        # includes are relative to the url
+        return ConfigFactory.parse_string(content.decode("utf-8"), os.path.dirname(uri))
+
+    from dataconf.remote import pool
+
+    if cache:
+        return url_cache.lookup(uri, timeout, parse)
+    return parse(pool.get(uri, {}, timeout).body)
+
+
+def _load_path(
+    path: str,
+    loader: Optional[str],
+    cache: bool,
+    cache_dir: Optional[str],
+    pure_yaml: bool,
+    allow_missing: bool = False,
+) -> Union["ConfigTree", Any]:
+    if allow_missing and not os.path.exists(path):
+        return {}
+
+    if cache:
+        return file_cache.lookup(
+            file_key(path, loader),
+            lambda: _load_file(path, loader, cache_dir, pure_yaml),
+        )
+    return _load_file(path, loader, cache_dir, pure_yaml)
+
+
+class Source:
+    """Source of a chain fetched and parsed when the chain is merged."""
+
+    def __init__(self, load: Callable[..., Any], *args: Any) -> None:
+        self.load = load
+        self.args = args
+
+    def __call__(self) -> Union["ConfigTree", Any]:
+        return self.load(*self.args)
+
+
 class Multi:
-    def __init__(self, confs: List[ConfigTree], strict: bool = True, **kwargs) -> None:
+    def __init__(
+        self, confs: List[Union["ConfigTree", Any]], strict: bool = True, **kwargs
+    ) -> None:
         self.confs = confs
         self.strict = strict
         self.kwargs = kwargs
 
+    @property
+    def confs(self) -> List[Union["ConfigTree", Any]]:
+        """Parsed configs and pending sources, in order of priority."""
+        confs = []
+        link = self.link
+        while link is not None:
+            link, conf = link
+            confs.append(conf)
+        confs.reverse()
+        return confs
+
+    @confs.setter
+    def confs(self, confs: List[Union["ConfigTree", Any]]) -> None:
+        # persistent (previous, conf) links, chains built from a chain share its links
+        self.link = None
+        for conf in confs:
+            self.link = (self.link, conf)
+
+    def push(self, conf: Union["ConfigTree", Source, Any], **kwargs) -> "Multi":
+        multi = Multi([], self.strict, **kwargs)
+        multi.link = (self.link, conf)
+        return multi
+
     def env(self, prefix: str, **kwargs) -> "Multi":
-        self.strict = False
         data = env_vars_parse(prefix, os.environ)
-        return self.dict(data, **kwargs)
+        multi = self.push(_from_dict(data), **kwargs)
+        # values might be casted from here on
+        multi.strict = False
+        return multi
 
     def dict(self, obj: Dict[str, Any], **kwargs) -> "Multi":
-        conf = ConfigFactory.from_dict(obj)
-        return Multi(self.confs + [conf], self.strict, **kwargs)
-
-    def string(self, s: str, loader: str = HOCON, **kwargs) -> "Multi":
-        if loader == YAML:
-            data = safe_load(s)
-            return self.dict(data, **kwargs)
-
-        conf = ConfigFactory.parse_string(s)
-        return Multi(self.confs + [conf], self.strict, **kwargs)
+        return self.push(_from_dict(obj), **kwargs)
 
-    def url(self, uri: str, timeout: int = 10, **kwargs) -> "Multi":
-        path = urlparse(uri).path
-        if path.endswith(".yaml") or path.endswith(".yml"):
-            with contextlib.closing(urlopen(uri, timeout=timeout)) as fd:
-                s = fd.read().decode("utf-8")
-            return self.string(s, loader=YAML, **kwargs)
+    def string(
+        self, s: str, loader: str = HOCON, pure_yaml: bool = False, **kwargs
+    ) -> "Multi":
+        return self.push(Source(_load_string, s, loader, pure_yaml), **kwargs)
 
-        conf = ConfigFactory.parse_URL(uri, timeout=timeout, required=True)
-        return Multi(self.confs + [conf], self.strict, **kwargs)
+    def url(
+        self,
+        uri: str,
+        timeout: int = 10,
+        pure_yaml: bool = False,
+        cache: bool = False,
+        **kwargs,
+    ) -> "Multi":
+        return self.push(Source(_load_url, uri, timeout, pure_yaml, cache), **kwargs)
 
     def file(
         self,
         path: str,
         loader: Optional[str] = None,
         allow_missing: bool = False,
+        cache: bool = False,
+        cache_dir: Optional[str] = None,
+        pure_yaml: bool = False,
         **kwargs,
     ) -> "Multi":
-        if allow_missing and not os.path.exists(path):
-            return self.dict({}, **kwargs)
-
-        if loader == YAML or (
-            loader is None and (path.endswith(".yaml") or path.endswith(".yml"))
-        ):
-            with open(path, "r") as f:
-                data = safe_load(f)
-            return self.dict(data, **kwargs)
-
-        conf = ConfigFactory.parse_file(path)
-        return Multi(self.confs + [conf], self.strict, **kwargs)
+        # missing files are empty, checked when the chain is merged
+        conf = Source(
+            _load_path, path, loader, cache, cache_dir, pure_yaml, allow_missing
+        )
+        return self.push(conf, **kwargs)
 
     def cli(self, argv: List[str], **kwargs) -> "Multi":
         data = cli_parse(argv)
         return self.dict(data, **kwargs)
 
-    def on(self, clazz: Type):
-        conf, *nxts = self.confs
-        for nxt in nxts:
-            conf = ConfigTree.merge_configs(conf, nxt)
-        return parse(conf, clazz, self.strict, **self.kwargs)
+    def load(self, executor: Optional[Executor] = None) -> List[Any]:
+        """Fetch and parse the pending sources, concurrently when there are several.
+
+        Sources run on executor if given (e.g. a process pool for large HOCON files).
+        Otherwise files and urls run on a thread pool of the default size, and strings,
+        parsed in Python under the GIL, run inline. Parsed configs are kept for later
+        merges.
+        """
+        confs = self.confs
+        pending = [conf for conf in confs if isinstance(conf, Source)]
+        if not pending:
+            return confs
+
+        if executor is not None:
+            futures = [executor.submit(source) for source in pending]
+            results = [future.result() for future in futures]
+        else:
+            blocking = [source for source in pending if source.load is not _load_string]
+            if len(blocking) > 1:
+                with ThreadPoolExecutor() as pool:
+                    futures = {source: pool.submit(source) for source in blocking}
+                    results = [
+                        futures[source].result() if source in futures else source()
+                        for source in pending
+                    ]
+            else:
+                results = [source() for source in pending]
+
+        loaded = iter(results)
+        confs = [next(loaded) if isinstance(conf, Source) else conf for conf in confs]
+        self.confs = confs
+        return confs
+
+    def merge(self, executor: Optional[Executor] = None) -> Union["ConfigTree", Any]:
+        return merge_configs(self.load(executor))
+
+    def on(
+        self,
+        clazz: Type,
+        executor: Optional[Executor] = None,
+        memo: Optional[utils.DecodeMemo] = None,
+    ):
+        kwargs = self.kwargs if memo is None else {**self.kwargs, "memo": memo}
+        return parse(self.merge(executor), clazz, self.strict, **kwargs)
 
 
 multi = Multi([])
@@ -121,7 +387,10 @@ def url(uri: str, clazz: Type, **kwargs):
     return multi.url(uri, **kwargs).on(clazz)
 
 
-def file(path: str, clazz: Type, **kwargs):
+def file(path: str, clazz: Type, stream: bool = False, **kwargs):
+    if stream and _is_yaml(path, kwargs.get("loader")):
+        return _stream_file(path, clazz, **kwargs)
+
     return multi.file(path, **kwargs).on(clazz)
 
 
@@ -137,6 +406,109 @@ def loads(s: str, clazz: Type, **kwargs):
     return string(s, clazz, **kwargs)
 
 
+def loads_many(strings: Iterable[Union[str, bytes]], clazz: Type, **kwargs) -> List:
+    return Loader(clazz).loads_many(strings, **kwargs)
+
+
+def iloads_many(
+    strings: Iterable[Union[str, bytes]], clazz: Type, **kwargs
+) -> Iterator:
+    return Loader(clazz).iloads_many(strings, **kwargs)
+
+
+class Loader:
+    """Reusable loader bound to a dataclass whose decoder is compiled once."""
+
+    def __init__(self, clazz: Type, codegen: bool = False, **kwargs) -> None:
+        self.clazz = clazz
+        self.kwargs = kwargs
+        self.decoder = utils.compile_decoder(clazz, codegen)
+
+    def parse(self, conf: "ConfigTree", strict: bool = True, **kwargs):
+        ctx = utils.ParseContext(strict, **{**self.kwargs, **kwargs})
+        return _decode(self.decoder, conf, ctx)
+
+    def on(self, multi: Multi):
+        return self.parse(multi.merge(), multi.strict, **multi.kwargs)
+
+    def env(self, prefix: str, **kwargs):
+        return self.on(multi.env(prefix, **kwargs))
+
+    def dict(self, obj: Dict[str, Any], **kwargs):
+        return self.on(multi.dict(obj, **kwargs))
+
+    def string(self, s: str, **kwargs):
+        return self.on(multi.string(s, **kwargs))
+
+    def url(self, uri: str, **kwargs):
+        return self.on(multi.url(uri, **kwargs))
+
+    def file(self, path: str, stream: bool = False, **kwargs):
+        if stream and _is_yaml(path, kwargs.get("loader")):
+            return _stream_file(path, self.clazz, **{**self.kwargs, **kwargs})
+
+        return self.on(multi.file(path, **kwargs))
+
+    def cli(self, argv: List[str], **kwargs):
+        return self.on(multi.cli(argv, **kwargs))
+
+    def load(self, path: str, **kwargs):
+        return self.file(path, **kwargs)
+
+    def loads(self, s: str, **kwargs):
+        return self.string(s, **kwargs)
+
+    def loads_many(self, strings: Iterable[Union[str, bytes]], **kwargs) -> List:
+        return list(self.iloads_many(strings, **kwargs))
+
+    def iloads_many(
+        self,
+        strings: Iterable[Union[str, bytes]],
+        loader: str = HOCON,
+        pure_yaml: bool = False,
+        executor: Optional[Executor] = None,
+        chunksize: int = 64,
+        strict: bool = True,
+        **kwargs,
+    ) -> Iterator:
+        """Decode documents one by one, parsing chunks of them in executor if given.
+
+        Documents are decoded in order by the calling thread with the compiled decoder,
+        the parse step only runs in the executor, ahead of decoding by a bounded number
+        of chunks.
+        """
+        parse = partial(_load_strings, loader=loader, pure_yaml=pure_yaml)
+        options = {**self.kwargs, **kwargs}
+
+        def decode(conf: "ConfigTree") -> Any:
+            # each document is a decode of its own, e.g. with its own intern pool
+            return _decode(self.decoder, conf, utils.ParseContext(strict, **options))
+
+        if executor is None:
+            for s in strings:
+                conf = _load_string(s, loader, pure_yaml)
+                yield decode(conf)
+            return
+
+        strings = iter(strings)
+        chunks = iter(lambda: list(islice(strings, chunksize)), [])
+        pending = deque()
+        prefetch = 2 * (os.cpu_count() or 1)
+        for chunk in chunks:
+            pending.append(executor.submit(parse, chunk))
+            if len(pending) >= prefetch:
+                for conf in pending.popleft().result():
+                    yield decode(conf)
+
+        while pending:
+            for conf in pending.popleft().result():
+                yield decode(conf)
+
+
+def compile(clazz: Type, codegen: bool = False, **kwargs) -> Loader:
+    return Loader(clazz, codegen, **kwargs)
+
+
 def dump(file: str, instance: object, out: str):
     with open(file, "w") as f:
         f.write(dumps(instance, out=out))
@@ -145,6 +517,8 @@ def dump(file: str, instance: object, out: str):
 def dumps(instance: object, out: str):
     conf = utils.__generate(instance, "")
 
+    from pyhocon import HOCONConverter
+
     if out:
         if out.lower() == "hocon":
             return HOCONConverter.to_hocon(conf)
@@ -0,0 +1,181 @@
+"""Remote configs fetched over pooled keep-alive HTTP connections."""
+
+import http.client
+from threading import Lock
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import Tuple
+from urllib.error import HTTPError
+from urllib.error import URLError
+from urllib.parse import urljoin
+from urllib.parse import urlsplit
+
+from dataconf.version import __version__
+
+REDIRECTS = (301, 302, 303, 307, 308)
+
+
+class Response:
+    def __init__(
+        self, uri: str, status: int, headers: http.client.HTTPMessage, body: bytes
+    ) -> None:
+        self.uri = uri
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+class ConnectionPool:
+    """Idle HTTP(S) connections kept alive between fetches, per scheme, host and port.
+
+    Connections are checked out for a single request, so the pool can be shared by the
+    threads loading the sources of a chain. Schemes other than http(s) and hosts going
+    through a proxy are fetched with urlopen.
+    """
+
+    def __init__(self, maxsize: int = 8, max_redirects: int = 5) -> None:
+        self.maxsize = maxsize
+        self.max_redirects = max_redirects
+        self._idle: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+        self._lock = Lock()
+
+    def get(self, uri: str, headers: Mapping[str, str], timeout: float) -> Response:
+        """GET uri following redirects, raises HTTPError on error statuses like urlopen.
+
+        Like urllib, redirects are only followed to http(s), and only over pooled
+        connections, redirects to other schemes or proxied hosts raise HTTPError.
+        """
+        for _ in range(self.max_redirects + 1):
+            response = self._get(uri, headers, timeout)
+            location = response.headers.get("Location")
+            if response.status not in REDIRECTS or location is None:
+                break
+            target = urljoin(uri, location)
+            parts = urlsplit(target)
+            if parts.scheme not in ("http", "https") or _proxied(parts):
+                raise HTTPError(
+                    target,
+                    response.status,
+                    f"{http.client.responses.get(response.status, '')} - "
+                    f"Redirection to url '{target}' is not allowed",
+                    response.headers,
+                    None,
+                )
+            uri = target
+        else:
+            raise HTTPError(
+                response.uri,
+                response.status,
+                "The HTTP server returned a redirect error that would lead to an "
+                "infinite loop.",
+                response.headers,
+                None,
+            )
+
+        if response.status >= 400:
+            raise HTTPError(
+                response.uri,
+                response.status,
+                http.client.responses.get(response.status, ""),
+                response.headers,
+                None,
+            )
+        return response
+
+    def _get(self, uri: str, headers: Mapping[str, str], timeout: float) -> Response:
+        parts = urlsplit(uri)
+        if parts.scheme not in ("http", "https") or _proxied(parts):
+            return _urlopen(uri, headers, timeout)
+
+        key = (parts.scheme, parts.netloc)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        headers = {"User-Agent": f"dataconf/{__version__}", **headers}
+
+        conn = self._checkout(key)
+        reused = conn is not None
+        while True:
+            if conn is None:
+                cls = (
+                    http.client.HTTPSConnection
+                    if parts.scheme == "https"
+                    else http.client.HTTPConnection
+                )
+                conn = cls(parts.netloc, timeout=timeout)
+            else:
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+
+            try:
+                conn.request("GET", target, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except ConnectionError as e:
+                conn.close()
+                if not reused:
+                    raise URLError(e)
+                # the server closed the idle connection in the meantime, retry on a new one
+                conn, reused = None, False
+                continue
+            except OSError as e:
+                conn.close()
+                raise URLError(e)
+            except BaseException:
+                conn.close()
+                raise
+            break
+
+        if resp.will_close:
+            conn.close()
+        else:
+            self._checkin(key, conn)
+        return Response(uri, resp.status, resp.headers, body)
+
+    def _checkout(self, key: Tuple[str, str]) -> http.client.HTTPConnection:
+        with self._lock:
+            idle = self._idle.get(key)
+            return idle.pop() if idle else None
+
+    def _checkin(self, key: Tuple[str, str], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.maxsize:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def clear(self) -> None:
+        with self._lock:
+            conns = [conn for idle in self._idle.values() for conn in idle]
+            self._idle.clear()
+        for conn in conns:
+            conn.close()
+
+
+def _proxied(parts) -> bool:
+    from urllib.request import getproxies
+    from urllib.request import proxy_bypass
+
+    return parts.scheme in getproxies() and not proxy_bypass(parts.hostname or "")
+
+
+def _urlopen(uri: str, headers: Mapping[str, str], timeout: float) -> Response:
+    import contextlib
+    from urllib.request import Request
+    from urllib.request import urlopen
+
+    try:
+        with contextlib.closing(
+            urlopen(Request(uri, headers=dict(headers)), timeout=timeout)
+        ) as fd:
+            return Response(fd.geturl(), fd.status or 200, fd.headers, fd.read())
+    except HTTPError as e:
+        if e.code != 304:
+            raise
+        return Response(uri, e.code, e.headers, b"")
+
+
+pool = ConnectionPool()
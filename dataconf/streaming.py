@@ -0,0 +1,302 @@
+import os
+from typing import Any
+from typing import Dict
+from typing import get_args
+from typing import get_origin
+from typing import List
+from typing import Optional
+from typing import Type
+
+from dataconf import utils
+import yaml
+from yaml.composer import ComposerError
+from yaml.constructor import ConstructorError
+from yaml.events import AliasEvent
+from yaml.events import MappingEndEvent
+from yaml.events import MappingStartEvent
+from yaml.events import ScalarEvent
+from yaml.events import SequenceEndEvent
+from yaml.events import SequenceStartEvent
+from yaml.events import StreamEndEvent
+from yaml.nodes import ScalarNode
+
+MERGE_TAG = "tag:yaml.org,2002:merge"
+VALUE_TAG = "tag:yaml.org,2002:value"
+STR_TAG = "tag:yaml.org,2002:str"
+
+
+class _Merge:
+    """Marker of a YAML merge key (<<)."""
+
+
+MERGE = _Merge()
+
+
+class EventDecoder:
+    """Decode a YAML event stream straight into the target types.
+
+    Dataclasses, dicts and lists are decoded while their events are read, so that the
+    whole document is never built in memory. Any other value (scalars, tuples, unions,
+    anchored nodes) is built as a plain value and handed to its compiled decoder. Unlike
+    the default pipeline, keys are never split on dots. Relative sidecar files are
+    resolved against base when given.
+    """
+
+    def __init__(
+        self,
+        loader: yaml.BaseLoader,
+        ctx: utils.ParseContext,
+        base: Optional[str] = None,
+    ) -> None:
+        self.loader = loader
+        self.ctx = ctx
+        self.base = base
+        self.anchors: Dict[str, Any] = {}
+
+    def document(self, clazz: Type) -> Any:
+        loader = self.loader
+        loader.get_event()  # stream start
+
+        if loader.check_event(StreamEndEvent):
+            value = utils.compile_decoder(clazz)(None, "", self.ctx)
+        else:
+            loader.get_event()  # document start
+            value = self.decode(clazz, "")
+            loader.get_event()  # document end
+
+        if not loader.check_event(StreamEndEvent):
+            event = loader.get_event()
+            raise ComposerError(
+                "expected a single document in the stream",
+                None,
+                "but found another document",
+                event.start_mark,
+            )
+        return value
+
+    def decode(self, clazz: Type, path: utils.KeyPath) -> Any:
+        event = self.loader.peek_event()
+        if getattr(event, "anchor", None) is None:
+            if isinstance(event, MappingStartEvent):
+                decoder = utils.compile_decoder(clazz)
+                if isinstance(decoder, utils.DataclassDecoder):
+                    return self.decode_dataclass(decoder, path)
+                if get_origin(clazz) is dict and len(get_args(clazz)) == 2:
+                    return self.decode_dict(get_args(clazz)[1], path)
+
+            # lists of numbers are decoded in bulk once built
+            if (
+                isinstance(event, SequenceStartEvent)
+                and get_origin(clazz) is list
+                and len(get_args(clazz)) == 1
+                and get_args(clazz)[0] not in (int, float)
+            ):
+                return self.decode_list(get_args(clazz)[0], path)
+
+        return utils.compile_decoder(clazz)(self.build(), path, self.ctx)
+
+    def decode_dataclass(
+        self, decoder: utils.DataclassDecoder, path: utils.KeyPath
+    ) -> Any:
+        keys = decoder.keys
+        present = {}
+        merged: Dict[Any, Any] = {}
+
+        self.loader.get_event()
+        while not self.loader.check_event(MappingEndEvent):
+            key = self.key()
+            if key is MERGE:
+                merged.update(self.merge_value())
+            elif key in keys:
+                name, clazz = keys[key]
+                present[key] = self.decode(clazz, (path, ".", name))
+            elif self.ctx.ignore_unexpected:
+                self.skip()
+                present[key] = None
+            else:
+                present[key] = self.build()
+        self.loader.get_event()
+
+        for key, value in merged.items():
+            if key in present:
+                continue
+            if key in keys:
+                name, clazz = keys[key]
+                value = utils.compile_decoder(clazz)(value, (path, ".", name), self.ctx)
+            present[key] = value
+
+        return decoder.build(present, path, self.ctx)
+
+    def decode_dict(self, clazz: Type, path: utils.KeyPath) -> Dict[Any, Any]:
+        ret = {}
+        merged: Dict[Any, Any] = {}
+
+        self.loader.get_event()
+        while not self.loader.check_event(MappingEndEvent):
+            key = self.key()
+            if key is MERGE:
+                merged.update(self.merge_value())
+            else:
+                ret[key] = self.decode(clazz, (path, ".", key))
+        self.loader.get_event()
+
+        if merged:
+            decoder = utils.compile_decoder(clazz)
+            for key, value in merged.items():
+                if key not in ret:
+                    ret[key] = decoder(value, (path, ".", key), self.ctx)
+
+        return ret
+
+    def decode_list(self, clazz: Type, path: utils.KeyPath) -> List[Any]:
+        item_path = (path, "[]", "")
+        ret = []
+
+        self.loader.get_event()
+        while not self.loader.check_event(SequenceEndEvent):
+            ret.append(self.decode(clazz, item_path))
+        self.loader.get_event()
+
+        return ret
+
+    def key(self) -> Any:
+        event = self.loader.peek_event()
+        if isinstance(event, ScalarEvent) and event.anchor is None:
+            tag = self.tag(event)
+            if tag == MERGE_TAG:
+                self.loader.get_event()
+                return MERGE
+        return self.build()
+
+    def merge_value(self) -> Dict[Any, Any]:
+        # explicit keys override merged ones, first mappings of a list take precedence
+        start = self.loader.peek_event()
+        value = self.build()
+        mappings = value if isinstance(value, list) else [value]
+        merged: Dict[Any, Any] = {}
+        for mapping in reversed(mappings):
+            if not isinstance(mapping, dict):
+                raise ConstructorError(
+                    "while constructing a mapping",
+                    None,
+                    "expected a mapping or list of mappings for merging",
+                    start.start_mark,
+                )
+            merged.update(mapping)
+        return merged
+
+    def tag(self, event: ScalarEvent) -> str:
+        tag = event.tag
+        if tag is None or tag == "!":
+            tag = self.loader.resolve(ScalarNode, event.value, event.implicit)
+        return STR_TAG if tag == VALUE_TAG else tag
+
+    def build(self) -> Any:
+        """Build the next node as a plain value, like safe_load would."""
+        loader = self.loader
+        event = loader.get_event()
+
+        if isinstance(event, AliasEvent):
+            if event.anchor not in self.anchors:
+                raise ComposerError(
+                    None,
+                    None,
+                    f"found undefined alias {event.anchor}",
+                    event.start_mark,
+                )
+            return self.anchors[event.anchor]
+
+        if isinstance(event, ScalarEvent):
+            tag = self.tag(event)
+            node = ScalarNode(
+                tag, event.value, event.start_mark, event.end_mark, style=event.style
+            )
+            # constructors are called directly, construct_object would keep every node
+            constructor = loader.yaml_constructors.get(
+                tag, loader.yaml_constructors[None]
+            )
+            value = constructor(loader, node)
+
+        elif isinstance(event, SequenceStartEvent):
+            value = []
+            if event.anchor is not None:
+                self.anchors[event.anchor] = value
+            while not loader.check_event(SequenceEndEvent):
+                value.append(self.build())
+            loader.get_event()
+
+        elif isinstance(event, MappingStartEvent):
+            value = {}
+            if event.anchor is not None:
+                self.anchors[event.anchor] = value
+            merged: Dict[Any, Any] = {}
+            while not loader.check_event(MappingEndEvent):
+                key = self.key()
+                if key is MERGE:
+                    merged.update(self.merge_value())
+                else:
+                    value[key] = self.build()
+            loader.get_event()
+            for key, v in merged.items():
+                value.setdefault(key, v)
+            if self.base is not None:
+                utils.resolve_sidecar(value, self.base)
+
+        else:
+            raise ComposerError(
+                None, None, f"unexpected event {event}", event.start_mark
+            )
+
+        if event.anchor is not None:
+            self.anchors[event.anchor] = value
+        return value
+
+    def skip(self) -> None:
+        """Consume the next node, only building anchored nodes that may be referenced."""
+        event = self.loader.peek_event()
+        if event.anchor is not None or isinstance(event, AliasEvent):
+            self.build()
+            return
+
+        self.loader.get_event()
+        if isinstance(event, ScalarEvent):
+            return
+
+        end = (
+            MappingEndEvent
+            if isinstance(event, MappingStartEvent)
+            else SequenceEndEvent
+        )
+        while not self.loader.check_event(end):
+            self.skip()
+        self.loader.get_event()
+
+
+def load(path: str, clazz: Type, **kwargs) -> Any:
+    """Decode a YAML file into clazz without building the intermediate document."""
+    with open(path, "r") as f:
+        return loads(f, clazz, **kwargs)
+
+
+def loads(
+    stream: Any,
+    clazz: Type,
+    strict: bool = True,
+    ignore_unexpected: bool = False,
+    pure_yaml: bool = False,
+    slots: bool = False,
+    intern: bool = False,
+) -> Any:
+    # relative sidecar files of files are next to them
+    name = getattr(stream, "name", None)
+    base = os.path.dirname(os.path.abspath(name)) if isinstance(name, str) else None
+
+    loader = utils.yaml_loader(pure_yaml)(stream)
+    try:
+        ctx = utils.ParseContext(strict, ignore_unexpected, slots=slots, intern=intern)
+        return EventDecoder(loader, ctx, base).document(clazz)
+    except Exception as e:
+        utils.rendered(e)
+        raise
+    finally:
+        loader.dispose()
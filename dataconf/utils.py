@@ -1,4 +1,7 @@
+from array import array
 from dataclasses import _MISSING_TYPE
+from dataclasses import Field
+from dataclasses import MISSING
 from dataclasses import asdict
 from dataclasses import fields
 from dataclasses import is_dataclass
@@ -6,14 +9,28 @@ from datetime import datetime
 from datetime import timedelta
 from enum import Enum
 from enum import IntEnum
+from functools import cached_property
+from functools import lru_cache
 from inspect import isclass
 from pathlib import Path
-
+import marshal
+import mmap
+import os
+import re
+import sys
+from threading import RLock
+from types import MemberDescriptorType
+
+from typing import Annotated
 from typing import Any, Literal
+from typing import Callable
 from typing import Dict
+from typing import FrozenSet
 from typing import get_args
 from typing import get_origin
 from typing import List
+from typing import Optional
+from typing import Tuple
 from typing import Type
 from typing import Union
 
@@ -24,14 +41,6 @@ from dataconf.exceptions import MissingTypeException
 from dataconf.exceptions import ParseException
 from dataconf.exceptions import TypeConfigException
 from dataconf.exceptions import UnexpectedKeysException
-from dateutil.parser import isoparse
-from dateutil.relativedelta import relativedelta
-from pyhocon import ConfigFactory
-from pyhocon.config_tree import ConfigList
-from pyhocon.config_tree import ConfigTree
-from isodate import parse_duration
-from isodate import Duration
-import pyparsing
 
 from dataconf.version import PY310up
 
@@ -42,19 +51,218 @@ if PY310up:
 
 NoneType = type(None)
 
+# linked (parent, separator, key) segments down from a root string, see path_to_str
+KeyPath = Union[str, Tuple[Any, str, Any]]
+Decoder = Callable[[Any, KeyPath, "ParseContext"], Any]
+
+# compiled decoders and slotted variants by type, bounded as types may be created at
+# runtime (e.g. with make_dataclass), the ones compiled first are evicted first
+_MAX_COMPILED = 1024
+_decoders: Dict[Any, Decoder] = {}
+_pending: Dict[Any, Decoder] = {}
+_lock = RLock()
+
+
+def _publish(cache: Dict[Any, Any], entries: Dict[Any, Any]) -> None:
+    cache.update(entries)
+    while len(cache) > _MAX_COMPILED:
+        # dicts keep their insertion order
+        del cache[next(iter(cache))]
+
+
+class ParseContext:
+    """Per call parsing options shared by all the decoders of a tree."""
+
+    __slots__ = ("strict", "ignore_unexpected", "memo", "slots", "pool")
+
+    def __init__(
+        self,
+        strict: bool = True,
+        ignore_unexpected: bool = False,
+        memo: Optional["DecodeMemo"] = None,
+        slots: bool = False,
+        intern: bool = False,
+    ) -> None:
+        self.strict = strict
+        self.ignore_unexpected = ignore_unexpected
+        self.memo = memo
+        # dataclasses are decoded into their slotted variants, see slotted
+        self.slots = slots
+        # equal strings, and paths, datetimes and durations parsed from equal values,
+        # share one object for the duration of the decode
+        self.pool: Optional[Dict[Any, Any]] = {} if intern else None
+
+
+class DecodeMemo:
+    """Frozen dataclass instances of the last decode, reused by the next one.
+
+    Passed to successive decodes of a changing config (e.g. on reload), subtrees equal to
+    the ones found at the same position in the previous decode give back the previous
+    frozen instances. The cost then scales with the changes and unchanged parts keep
+    their identity. Subtrees are compared with a snapshot taken when they were decoded,
+    telling the types of their values apart (e.g. 1 and True), so that configs mutated in
+    place between decodes are decoded again.
+    """
+
+    def __init__(self) -> None:
+        # instances of the last decode as a tree mirroring the frozen dataclasses,
+        # (path, clazz, typed, position) -> (snapshot, instance, nested entries)
+        self.entries: Dict[Tuple[KeyPath, Type, bool, int], Tuple] = {}
+        self.options: Optional[Tuple[bool, ...]] = None
+        self.hits = 0
+        self.misses = 0
+        # (previous entries, entries, positions) of the instances being decoded
+        self._frames: List[Tuple[Dict, Dict, Dict]] = []
+
+    def decode(self, decoder: Decoder, value: Any, ctx: ParseContext) -> Any:
+        options = (ctx.strict, ctx.ignore_unexpected, ctx.slots, ctx.pool is not None)
+        if options != self.options:
+            # instances decoded with other options might differ
+            self.entries = {}
+            self.options = options
+        entries: Dict = {}
+        self._frames = [(self.entries, entries, {})]
+        try:
+            decoded = decoder(value, "", ctx)
+            self.entries = entries
+            return decoded
+        finally:
+            self._frames = []
+
+    def reuse(
+        self,
+        decode: Decoder,
+        clazz: Type,
+        value: Any,
+        path: KeyPath,
+        ctx: ParseContext,
+        typed: bool,
+    ) -> Any:
+        previous, entries, positions = self._frames[-1]
+        # items of a list share their path and are told apart by their position
+        key = (path, clazz, typed)
+        position = positions.get(key, 0)
+        positions[key] = position + 1
+        key = (path, clazz, typed, position)
+
+        entry = previous.get(key)
+        snapshot = _snapshot(value)
+        if entry is not None and entry[0] == snapshot:
+            # reused along with its nested instances
+            self.hits += 1
+            entries[key] = entry
+            return entry[1]
+
+        self.misses += 1
+        nested: Dict = {}
+        self._frames.append((entry[2] if entry is not None else {}, nested, {}))
+        try:
+            instance = decode(value, path, ctx, typed)
+        finally:
+            self._frames.pop()
+        entries[key] = (snapshot, instance, nested)
+        return instance
 
-def __parse_type(value: Any, clazz: Type, path: str, check: bool):
+
+def _snapshot(value: Any) -> Any:
+    """Copy of a subtree owned by the memo, equal only for equal values of equal types."""
     try:
-        if check:
-            return value
-    except TypeError:
-        pass
+        # exact types are serialized in C
+        return marshal.dumps(value, 0)
+    except ValueError:
+        # ConfigTrees and other types marshal does not support
+        return _typed_copy(value)
+
+
+def _typed_copy(value: Any) -> Any:
+    if isinstance(value, dict):
+        # keys of equal dicts in another order are conservatively reported as different
+        return tuple((k, _typed_copy(v)) for k, v in dict.items(value))
+    if isinstance(value, list):
+        return [_typed_copy(v) for v in value]
+    return (value.__class__, value)
+
+
+class LazyMessage:
+    """Exception message rendered on first use.
+
+    Type errors are mostly caught while trying the members of unions or the
+    subclasses of a base, their messages are only formatted if they surface. Decodes
+    render them before their exceptions leave, see rendered.
+    """
+
+    __slots__ = ("render", "args", "text")
+
+    def __init__(self, render: Callable[..., str], *args: Any) -> None:
+        self.render = render
+        self.args = args
+        self.text = None
+
+    def __str__(self) -> str:
+        if self.text is None:
+            self.text = self.render(*self.args)
+        return self.text
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+
+def rendered(e: BaseException) -> BaseException:
+    """Replace the lazy messages of an exception leaving a decode by their str."""
+    if any(isinstance(arg, LazyMessage) for arg in e.args):
+        e.args = tuple(
+            str(arg) if isinstance(arg, LazyMessage) else arg for arg in e.args
+        )
+    return e
+
+
+def _type_message(value_type: Type, clazz: Type, path: KeyPath) -> str:
+    return f"expected type {clazz} at {path_to_str(path)}, got {value_type}"
 
-    raise TypeConfigException(
-        f"expected type {clazz} at {path_to_str(path)}, got {type(value)}"
+
+def _one_of_message(args: Tuple, path: KeyPath, got: Any) -> str:
+    return (
+        f"expected one of {', '.join(map(str, args))} at {path_to_str(path)}, got {got}"
     )
 
 
+def _path_message(template: str, path: KeyPath, *args: Any) -> str:
+    return template.format(*args, path=path_to_str(path))
+
+
+def _subclasses_message(clazz: Type, path: KeyPath, failures: List[Exception]) -> str:
+    failures = "\n- ".join([str(c) for c in failures])
+    return f"expected type {clazz} at {path_to_str(path)}, failed subclasses:\n- {failures}"
+
+
+def _type_error(value: Any, clazz: Type, path: KeyPath):
+    return TypeConfigException(LazyMessage(_type_message, type(value), clazz, path))
+
+
+def loaded(module: str, name: str) -> Any:
+    """Return an attribute of a lazily imported backend, None until it is imported.
+
+    Heavy backends (pyhocon, yaml, dateutil, isodate) are only imported on first use,
+    values or type hints of theirs cannot exist before that.
+    """
+    mod = sys.modules.get(module)
+    return getattr(mod, name, None) if mod is not None else None
+
+
+def is_config_tree(value: Any) -> bool:
+    config_tree = loaded("pyhocon.config_tree", "ConfigTree")
+    return config_tree is not None and isinstance(value, config_tree)
+
+
+def yaml_loader(pure: bool = False) -> Type:
+    """Return the libyaml SafeLoader when PyYAML was built with it, unless pure is set."""
+    import yaml
+
+    if pure:
+        return yaml.SafeLoader
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
 def is_union(origin):
     return origin is Union or (PY310up and origin is UnionType)
 
@@ -64,244 +272,930 @@ def is_optional(type: Type | Any | str):
     return is_union(get_origin(type)) and NoneType in get_args(type)
 
 
-def __parse(value: any, clazz: Type, path: str, strict: bool, ignore_unexpected: bool):
-    if is_dataclass(clazz):
-        if not isinstance(value, ConfigTree):
-            raise TypeConfigException(
-                f"expected type {clazz} at {path_to_str(path)}, got {type(value)}"
-            )
+def compile_decoder(clazz: Type, codegen: bool = False) -> Decoder:
+    """Return the decoder of clazz, compiling and caching it on first use.
 
-        fs = {}
-        renamings = dict()
-
-        for f in fields(clazz):
-            if f.name in value:
-                val = value[f.name]
-            elif f.name.replace("_", "-") in value:
-                renamings[f.name] = f.name.replace("_", "-")
-                val = value[f.name.replace("_", "-")]
-            else:
-                if callable(f.default_factory):
-                    val = f.default_factory()
+    With codegen, dataclasses are decoded by a function generated from their fields.
+    """
+    key = (clazz, codegen)
+    try:
+        decoder = _decoders.get(key)
+    except TypeError:
+        # unhashable type hints (e.g. Literal of a list) cannot be cached
+        return __build_decoder(clazz, codegen)
+
+    if decoder is not None:
+        return decoder
+
+    with _lock:
+        decoder = _decoders.get(key) or _pending.get(key)
+        if decoder is not None:
+            return decoder
+
+        outermost = len(_pending) == 0
+        try:
+            decoder = __build_decoder(clazz, codegen)
+            _pending[key] = decoder
+            if outermost:
+                # only publish once recursive dataclasses are fully compiled
+                _publish(_decoders, _pending)
+        finally:
+            if outermost:
+                _pending.clear()
+
+    return decoder
+
+
+_slotted: Dict[Type, Type] = {}
+
+
+def slotted(clazz: Type) -> Type:
+    """Return the variant of dataclass clazz storing its fields in __slots__, without __dict__.
+
+    Slots cannot be added to a subclass of a class with a __dict__, the variant is
+    built from the namespaces of clazz and its bases instead. It reports clazz as its
+    __class__ so that isinstance checks, comparisons with plain instances and reprs
+    behave as with clazz, only type() tells them apart, and dataclasses.replace gives
+    plain instances of clazz. Instances pickle and copy as slotted instances and keep
+    supporting weak references when clazz does. Dataclasses with a __post_init__, which may set attributes other
+    than fields, or a cached_property, which stores its value in the instance __dict__,
+    are returned as is.
+    """
+    variant = _slotted.get(clazz)
+    if variant is not None:
+        return variant
+
+    with _lock:
+        variant = _slotted.get(clazz)
+        if variant is not None:
+            return variant
+
+        if any(
+            "__post_init__" in base.__dict__
+            or any(isinstance(v, cached_property) for v in base.__dict__.values())
+            for base in clazz.__mro__
+        ):
+            _publish(_slotted, {clazz: clazz})
+            return clazz
+
+        names = [f.name for f in fields(clazz)]
+        slots = dict.fromkeys(names)
+        namespace: Dict[str, Any] = {}
+        # bases first so that clazz overrides them, object is left out
+        for base in reversed(clazz.__mro__[:-1]):
+            for k, v in base.__dict__.items():
+                if isinstance(v, MemberDescriptorType):
+                    # slot of a base, descriptors only apply to the class declaring them
+                    slots[k] = None
                 else:
-                    val = f.default
-                if is_dataclass(val):
-                    # if val is a dataclass, convert to ConfigTree
-                    val = ConfigFactory.from_dict(asdict(val))
+                    namespace[k] = v
+        for k in ("__dict__", "__weakref__", "__slots__", *names):
+            # field defaults are class attributes, __init__ holds them already
+            namespace.pop(k, None)
+        # last, so that it is left out of the values of __reduce__
+        weakref = ("__weakref__",) if hasattr(clazz, "__weakref__") else ()
+        namespace["__slots__"] = (*slots, *weakref)
+        namespace["__qualname__"] = clazz.__qualname__
+        namespace["__class__"] = property(lambda self: clazz)
+        namespace["__reduce__"] = lambda self: (
+            _restore_slotted,
+            (clazz, tuple(getattr(self, name) for name in slots)),
+        )
 
-            if not isinstance(val, _MISSING_TYPE):
-                fs[f.name] = __parse(
-                    val, f.type, f"{path}.{f.name}", strict, ignore_unexpected
+        variant = type(clazz)(clazz.__name__, (object,), namespace)
+        _publish(_slotted, {clazz: variant})
+        return variant
+
+
+def _restore_slotted(clazz: Type, values: Tuple) -> Any:
+    variant = slotted(clazz)
+    instance = object.__new__(variant)
+    for name, value in zip(variant.__slots__, values):
+        object.__setattr__(instance, name, value)
+    return instance
+
+
+class DataclassDecoder:
+    """Compiled decoder of a dataclass, fields are resolved once at compile time."""
+
+    def __init__(self, clazz: Type, codegen: bool = False) -> None:
+        self.clazz = clazz
+        self.codegen = codegen
+        self.fields: List[Tuple[str, Optional[str], Decoder, Callable]] = []
+        # field name and type of each accepted key (names and dashed aliases)
+        self.keys: Dict[str, Tuple[str, Type]] = {}
+        # accepted keys of the fields that must be present
+        self.required: List[Tuple[str, str]] = []
+
+    def compile(self) -> None:
+        compiled = []
+        keys = {}
+        required = []
+        for f in fields(self.clazz):
+            alias = f.name.replace("_", "-")
+            keys[alias] = keys[f.name] = (f.name, f.type)
+            decoder = compile_decoder(f.type, self.codegen)
+            missing, is_required = self.compile_missing(f, decoder)
+            if is_required:
+                required.append((f.name, alias))
+            compiled.append(
+                (
+                    f.name,
+                    alias if alias != f.name else None,
+                    decoder,
+                    missing,
                 )
+            )
+        self.fields = compiled
+        self.keys = keys
+        self.required = required
+
+    def compile_missing(self, f: Field, decoder: Decoder) -> Tuple[Callable, bool]:
+        """Return the handler of a missing field and whether it fails."""
+        clazz = self.clazz
+        name = f.name
+        factory = f.default_factory if callable(f.default_factory) else None
+        default = f.default
+
+        if factory is not None or not isinstance(default, _MISSING_TYPE):
+
+            def missing_default(path, ctx):
+                val = factory() if factory is not None else default
+                if is_dataclass(val):
+                    # if val is a dataclass, convert to a plain dict
+                    val = asdict(val)
+                return decoder(val, (path, ".", name), ctx)
+
+            return missing_default, False
 
-            elif is_optional(f.type):
+        if is_optional(f.type):
+
+            def missing_optional(path, ctx):
                 # Optional not found
-                fs[f.name] = None
-
-            elif is_dataclass(f.type):
-                if all(
-                    not isinstance(field.default, _MISSING_TYPE)
-                    or not isinstance(field.default_factory, _MISSING_TYPE)
-                    or is_optional(field.type)
-                    for field in fields(f.type)
-                ):
-                    fs[f.name] = f.type(
-                        **{
-                            field.name: None
-                            for field in fields(f.type)
-                            if is_optional(field.type)
-                        }
-                    )
-                else:
-                    raise MalformedConfigException(
-                        f'expected type {clazz} at {path_to_str(path)}, no field "{f.name}" found and {f.type} cannot be implicitly created'
-                    )
+                return None
 
-            else:
-                raise MalformedConfigException(
-                    f'expected type {clazz} at {path_to_str(path)}, no field "{f.name}" found'
+            return missing_optional, False
+
+        if is_dataclass(f.type) and all(
+            not isinstance(field.default, _MISSING_TYPE)
+            or not isinstance(field.default_factory, _MISSING_TYPE)
+            or is_optional(field.type)
+            for field in fields(f.type)
+        ):
+            implicit = f.type
+            nones = {
+                field.name: None for field in fields(f.type) if is_optional(field.type)
+            }
+
+            def missing_implicit(path, ctx):
+                if ctx.slots:
+                    return slotted(implicit)(**nones)
+                return implicit(**nones)
+
+            return missing_implicit, False
+
+        if is_dataclass(f.type):
+            message = (
+                f'no field "{f.name}" found and {f.type} cannot be implicitly created'
+            )
+        else:
+            message = f'no field "{f.name}" found'
+
+        def missing_field(path, ctx):
+            raise MalformedConfigException(
+                LazyMessage(
+                    _path_message,
+                    "expected type {} at {path}, {}",
+                    path,
+                    clazz,
+                    message,
                 )
+            )
 
-        unexpected_keys = value.keys() - {renamings.get(k, k) for k in fs.keys()}
-        if len(unexpected_keys) > 0 and not ignore_unexpected:
+        return missing_field, True
+
+    def __call__(
+        self, value: Any, path: KeyPath, ctx: ParseContext, typed: bool = False
+    ):
+        """Decode value, typed values carry a _type discriminator which is not a field."""
+        if not isinstance(value, dict):
+            raise _type_error(value, self.clazz, path)
+
+        fs = {}
+        found = 0
+        for name, alias, decoder, missing in self.fields:
+            # plain dict lookups skip ConfigTree key path parsing, field names never contain dots
+            val = dict.get(value, name, MISSING)
+            if val is MISSING and alias is not None:
+                val = dict.get(value, alias, MISSING)
+
+            if val is MISSING:
+                fs[name] = missing(path, ctx)
+            else:
+                found += 1
+                fs[name] = decoder(val, (path, ".", name), ctx)
+
+        if found + typed != len(value) and not ctx.ignore_unexpected:
+            self.check_unexpected(value, path, typed)
+
+        if ctx.slots:
+            return slotted(self.clazz)(**fs)
+        return self.clazz(**fs)
+
+    def generate(self) -> Decoder:
+        """Generate a decoder specialized to the fields, in the spirit of dataclass __init__."""
+        scope = {
+            "clazz": self.clazz,
+            "MISSING": MISSING,
+            "get": dict.get,
+            "type_error": _type_error,
+            "check_unexpected": self.check_unexpected,
+            "slotted": slotted,
+        }
+        lines = [
+            "def decode(value, path, ctx, typed=False):",
+            "    if not isinstance(value, dict):",
+            "        raise type_error(value, clazz, path)",
+            "    found = 0",
+        ]
+        kwargs = []
+        for i, (name, alias, decoder, missing) in enumerate(self.fields):
+            scope[f"decoder_{i}"] = decoder
+            scope[f"missing_{i}"] = missing
+            lines.append(f"    val = get(value, {name!r}, MISSING)")
+            if alias is not None:
+                lines.append("    if val is MISSING:")
+                lines.append(f"        val = get(value, {alias!r}, MISSING)")
+            lines.append("    if val is MISSING:")
+            lines.append(f"        field_{i} = missing_{i}(path, ctx)")
+            # exact scalar types are returned as is by their decoders
+            exact = self.exact_types.get(decoder)
+            if exact is not None:
+                scope[f"exact_{i}"] = exact
+                # interned strings go through their decoder
+                interned = " and ctx.pool is None" if exact is str else ""
+                lines.append(f"    elif val.__class__ is exact_{i}{interned}:")
+                lines.append("        found += 1")
+                lines.append(f"        field_{i} = val")
+            lines.append("    else:")
+            lines.append("        found += 1")
+            lines.append(
+                f"        field_{i} = decoder_{i}(val, (path, '.', {name!r}), ctx)"
+            )
+            kwargs.append(f"{name}=field_{i}")
+        lines.append(
+            "    if found + typed != len(value) and not ctx.ignore_unexpected:"
+        )
+        lines.append("        check_unexpected(value, path, typed)")
+        lines.append("    if ctx.slots:")
+        lines.append(f"        return slotted(clazz)({', '.join(kwargs)})")
+        lines.append(f"    return clazz({', '.join(kwargs)})")
+
+        source = "\n".join(lines)
+        filename = f"<dataconf {self.clazz.__module__}.{self.clazz.__qualname__}>"
+        exec(compile(source, filename, "exec"), scope)
+        decode = scope["decode"]
+        if not self.clazz.__dataclass_params__.frozen:
+            return decode
+
+        def decode_frozen(value, path, ctx, typed=False):
+            memo = ctx.memo
+            if memo is None:
+                return decode(value, path, ctx, typed)
+            return memo.reuse(decode, self.clazz, value, path, ctx, typed)
+
+        return decode_frozen
+
+    @property
+    def exact_types(self) -> Dict[Decoder, Type]:
+        return {
+            compile_decoder(clazz, self.codegen): clazz
+            for clazz in (str, int, float, bool)
+        }
+
+    def build(self, present: Dict[str, Any], path: KeyPath, ctx: ParseContext):
+        """Construct the dataclass from values already decoded, keyed as in the source."""
+        fs = {}
+        found = 0
+        for name, alias, _, missing in self.fields:
+            if name in present:
+                found += 1
+                fs[name] = present[name]
+            elif alias is not None and alias in present:
+                found += 1
+                fs[name] = present[alias]
+            else:
+                fs[name] = missing(path, ctx)
+
+        if found != len(present) and not ctx.ignore_unexpected:
+            self.check_unexpected(present, path)
+
+        if ctx.slots:
+            return slotted(self.clazz)(**fs)
+        return self.clazz(**fs)
+
+    def check_unexpected(self, value: Any, path: KeyPath, typed: bool = False) -> None:
+        used = {
+            alias
+            if alias is not None
+            and not dict.__contains__(value, name)
+            and dict.__contains__(value, alias)
+            else name
+            for name, alias, _, _ in self.fields
+        }
+        if typed:
+            used.add("_type")
+        unexpected_keys = value.keys() - used
+        if len(unexpected_keys) > 0:
             raise UnexpectedKeysException(
-                f'unexpected key(s) "{", ".join(unexpected_keys)}" detected for type {clazz} at {path_to_str(path)}'
+                LazyMessage(
+                    _path_message,
+                    'unexpected key(s) "{}" detected for type {} at {path}',
+                    path,
+                    ", ".join(unexpected_keys),
+                    self.clazz,
+                )
             )
 
-        return clazz(**fs)
+
+class FrozenDataclassDecoder(DataclassDecoder):
+    """Compiled decoder of a frozen dataclass, instances may be reused across decodes."""
+
+    def __call__(
+        self, value: Any, path: KeyPath, ctx: ParseContext, typed: bool = False
+    ):
+        memo = ctx.memo
+        if memo is None:
+            return DataclassDecoder.__call__(self, value, path, ctx, typed)
+        return memo.reuse(super().__call__, self.clazz, value, path, ctx, typed)
+
+
+def __build_decoder(clazz: Type, codegen: bool) -> Decoder:
+    if is_dataclass(clazz):
+        if clazz.__dataclass_params__.frozen:
+            decoder = FrozenDataclassDecoder(clazz, codegen)
+        else:
+            decoder = DataclassDecoder(clazz, codegen)
+        # registered before its fields so that recursive dataclasses resolve to it
+        _pending[(clazz, codegen)] = decoder
+        decoder.compile()
+        return decoder.generate() if codegen else decoder
 
     origin = get_origin(clazz)
     args = get_args(clazz)
 
-    if origin is list:
-        if value is None:
-            raise MalformedConfigException(
-                f"expected list at {path_to_str(path)} but received None"
-            )
+    if origin is Annotated:
+        # metadata is ignored, except array and numpy.ndarray storing a list of numbers
+        target, *metadata = args
+        ndarray = loaded("numpy", "ndarray")
+        if get_origin(target) is list and len(get_args(target)) == 1:
+            item = get_args(target)[0]
+            if any(m is array for m in metadata):
+                return __build_array_decoder(item, codegen)
+            if ndarray is not None and any(m is ndarray for m in metadata):
+                return __build_ndarray_decoder(_DTYPES.get(item), codegen)
+        return compile_decoder(target, codegen)
+
+    if clazz is array:
+        return __build_array_decoder(float, codegen)
+
+    if clazz is memoryview:
+
+        def decode_memoryview(value, path, ctx):
+            view = _mmap(value, path, "B")
+            if view is not None:
+                return view
+            try:
+                return memoryview(value)
+            except TypeError:
+                raise _type_error(value, clazz, path)
 
+        return decode_memoryview
+
+    ndarray = loaded("numpy", "ndarray")
+    if ndarray is not None and (clazz is ndarray or origin is ndarray):
+        # NDArray[numpy.float32] is ndarray[Any, dtype[numpy.float32]], the dtype of
+        # NDArray[Any] is inferred from the values
+        scalar = get_args(args[1])[0] if len(args) == 2 and get_args(args[1]) else None
+        dtype = "float64" if scalar is None else None if scalar is Any else scalar
+        return __build_ndarray_decoder(dtype, codegen)
+
+    if origin is list:
         if len(args) != 1:
-            raise MissingTypeException("expected list with type information: List[?]")
 
-        parse_candidate = args[0]
-        return [
-            __parse(v, parse_candidate, f"{path}[]", strict, ignore_unexpected)
-            for v in value
-        ]
+            def decode_untyped_list(value, path, ctx):
+                if value is None:
+                    raise MalformedConfigException(
+                        LazyMessage(
+                            _path_message,
+                            "expected list at {path} but received None",
+                            path,
+                        )
+                    )
+                raise MissingTypeException(
+                    "expected list with type information: List[?]"
+                )
+
+            return decode_untyped_list
+
+        item = args[0]
+        item_decoder = compile_decoder(item, codegen)
+        bulk = item in _NUMBERS
+
+        def decode_list(value, path, ctx):
+            if value is None:
+                raise MalformedConfigException(
+                    LazyMessage(
+                        _path_message, "expected list at {path} but received None", path
+                    )
+                )
+            if bulk:
+                numbers = _numbers(value, item, ctx)
+                if numbers is not None:
+                    return numbers
+            item_path = (path, "[]", "")
+            return [item_decoder(v, item_path, ctx) for v in value]
+
+        return decode_list
 
     if origin is tuple:
-        if value is None:
-            raise MalformedConfigException(
-                f"expected tuple at {path_to_str(path)} but received None"
+        has_ellipsis = len(args) > 0 and args[-1] == Ellipsis
+        if len(args) < 1 or (has_ellipsis and len(args) != 2):
+            message = (
+                "expected tuple with type information: Tuple[?]"
+                if len(args) < 1
+                else "expected one type since ellipsis is used: Tuple[?, ...]"
             )
 
-        if len(args) < 1:
-            raise MissingTypeException("expected tuple with type information: Tuple[?]")
+            def decode_untyped_tuple(value, path, ctx):
+                if value is None:
+                    raise MalformedConfigException(
+                        LazyMessage(
+                            _path_message,
+                            "expected tuple at {path} but received None",
+                            path,
+                        )
+                    )
+                raise MissingTypeException(message)
 
-        has_ellipsis = args[-1] == Ellipsis
-        if has_ellipsis and len(args) != 2:
-            raise MissingTypeException(
-                "expected one type since ellipsis is used: Tuple[?, ...]"
-            )
-        _args = args if not has_ellipsis else [args[0]] * len(value)
-        if len(value) > 0 and len(value) != len(_args):
-            raise MalformedConfigException(
-                "number of provided values does not match expected number of values for tuple."
+            return decode_untyped_tuple
+
+        item_decoders = [
+            compile_decoder(arg, codegen) for arg in args if arg != Ellipsis
+        ]
+
+        def decode_tuple(value, path, ctx):
+            if value is None:
+                raise MalformedConfigException(
+                    LazyMessage(
+                        _path_message,
+                        "expected tuple at {path} but received None",
+                        path,
+                    )
+                )
+            decoders = item_decoders if not has_ellipsis else item_decoders * len(value)
+            if len(value) > 0 and len(value) != len(decoders):
+                raise MalformedConfigException(
+                    "number of provided values does not match expected number of values for tuple."
+                )
+            item_path = (path, "[]", "")
+            return tuple(
+                decoder(v, item_path, ctx) for v, decoder in zip(value, decoders)
             )
-        return tuple(
-            __parse(v, arg, f"{path}[]", strict, ignore_unexpected)
-            for v, arg in zip(value, _args)
-        )
+
+        return decode_tuple
 
     if origin is dict:
         if len(args) != 2:
-            raise MissingTypeException(
-                "expected dict with type information: Dict[?, ?]"
-            )
-        if value is not None:
-            # ignore key type
-            parse_candidate = args[1]
-            return {
-                k: __parse(v, parse_candidate, f"{path}.{k}", strict, ignore_unexpected)
-                for k, v in value.items()
-            }
-        return None
+
+            def decode_untyped_dict(value, path, ctx):
+                raise MissingTypeException(
+                    "expected dict with type information: Dict[?, ?]"
+                )
+
+            return decode_untyped_dict
+
+        # ignore key type
+        value_decoder = compile_decoder(args[1], codegen)
+
+        def decode_dict(value, path, ctx):
+            if value is None:
+                return None
+            pool = ctx.pool
+            if pool is not None:
+                return {
+                    pool.setdefault(k, k) if k.__class__ is str else k: value_decoder(
+                        v, (path, ".", k), ctx
+                    )
+                    for k, v in value.items()
+                }
+            return {k: value_decoder(v, (path, ".", k), ctx) for k, v in value.items()}
+
+        return decode_dict
 
     if is_union(origin):
         # Optional = Union[T, NoneType]
-        has_none = False
-        for parse_candidate in args:
-            if parse_candidate is NoneType:
-                has_none = True
-            else:
+        has_none = NoneType in args
+        candidates = [
+            (arg, compile_decoder(arg, codegen)) for arg in args if arg is not NoneType
+        ]
+        # members that may decode values of a given class and strictness
+        screens: Dict[Tuple[Type, bool], List[Decoder]] = {}
+
+        def decode_union(value, path, ctx):
+            key = (value.__class__, ctx.strict)
+            decoders = screens.get(key)
+            if decoders is None:
+                decoders = screens[key] = [
+                    decoder
+                    for arg, decoder in candidates
+                    if may_decode(arg, value.__class__, ctx.strict)
+                ]
+
+            for decoder in decoders:
                 try:
-                    return __parse(
-                        value, parse_candidate, path, strict, ignore_unexpected
-                    )
+                    return decoder(value, path, ctx)
                 except TypeConfigException:
                     continue
 
-        if has_none:
-            return None
+            # values no member may decode are errors, not missing optional values
+            if has_none and (decoders or value is None):
+                return None
 
-        raise TypeConfigException(
-            f"expected one of {', '.join(map(str, args))} at {path_to_str(path)}, got {type(value)}"
-        )
+            raise TypeConfigException(
+                LazyMessage(_one_of_message, args, path, type(value))
+            )
+
+        return decode_union
 
     if clazz is bool:
-        if not strict and value is not None:
-            try:
-                value = bool(value)
-            except ValueError:
-                pass
-        return __parse_type(value, clazz, path, isinstance(value, bool))
+
+        def decode_bool(value, path, ctx):
+            if not ctx.strict and value is not None:
+                try:
+                    value = bool(value)
+                except ValueError:
+                    pass
+            if isinstance(value, bool):
+                return value
+            raise _type_error(value, clazz, path)
+
+        return decode_bool
 
     if clazz is int:
-        if not strict and value is not None:
-            try:
-                value = int(value)
-            except ValueError:
-                pass
-        return __parse_type(value, clazz, path, isinstance(value, int))
+
+        def decode_int(value, path, ctx):
+            if not ctx.strict and value is not None:
+                try:
+                    value = int(value)
+                except ValueError:
+                    pass
+            if isinstance(value, int):
+                return value
+            raise _type_error(value, clazz, path)
+
+        return decode_int
 
     if clazz is float:
-        if not strict and value is not None:
-            try:
-                value = float(value)
-            except ValueError:
-                pass
-        return __parse_type(
-            value, clazz, path, isinstance(value, float) or isinstance(value, int)
-        )
+
+        def decode_float(value, path, ctx):
+            if not ctx.strict and value is not None:
+                try:
+                    value = float(value)
+                except ValueError:
+                    pass
+            if isinstance(value, float) or isinstance(value, int):
+                return value
+            raise _type_error(value, clazz, path)
+
+        return decode_float
 
     if clazz is str:
-        return __parse_type(value, clazz, path, isinstance(value, str))
+
+        def decode_str(value, path, ctx):
+            if isinstance(value, str):
+                pool = ctx.pool
+                return value if pool is None else pool.setdefault(value, value)
+            raise _type_error(value, clazz, path)
+
+        return decode_str
 
     if clazz is Any:
-        if type(value) is ConfigTree:
-            return dict(value)
 
-        return value
+        def decode_any(value, path, ctx):
+            if isinstance(value, dict):
+                return dict(value)
+
+            return value
+
+        return decode_any
 
     if isclass(clazz) and (issubclass(clazz, Enum) or issubclass(clazz, IntEnum)):
-        if isinstance(value, int):
-            return clazz.__call__(value)
-        elif issubclass(clazz, str):
-            return clazz(value)
-        elif isinstance(value, str):
-            return clazz.__getitem__(value)
-        raise TypeConfigException(
-            f"expected str or int at {path_to_str(path)}, got {type(value)}"
-        )
+        str_enum = issubclass(clazz, str)
+
+        def decode_enum(value, path, ctx):
+            if isinstance(value, int):
+                return clazz.__call__(value)
+            elif str_enum:
+                return clazz(value)
+            elif isinstance(value, str):
+                return clazz.__getitem__(value)
+            raise TypeConfigException(
+                LazyMessage(
+                    _path_message,
+                    "expected str or int at {path}, got {}",
+                    path,
+                    type(value),
+                )
+            )
+
+        return decode_enum
 
     if isclass(clazz) and issubclass(clazz, Path):
-        return clazz.__call__(value)
 
-    if get_origin(clazz) is (Literal):
-        if value in args:
-            return value
-        raise TypeConfigException(
-            f"expected one of {', '.join(map(str, args))} at {path_to_str(path)}, got {value}"
-        )
+        def parse(value):
+            return parse_path(clazz, value)
+
+        def decode_path(value, path, ctx):
+            pool = ctx.pool
+            if pool is None:
+                return parse_path(clazz, value)
+            return _interned(pool, clazz, value, parse)
+
+        return decode_path
+
+    if origin is Literal:
+
+        def decode_literal(value, path, ctx):
+            if value in args:
+                return value
+            raise TypeConfigException(LazyMessage(_one_of_message, args, path, value))
+
+        return decode_literal
 
     if clazz is datetime:
-        dt = __parse_type(value, clazz, path, isinstance(value, str))
-        try:
-            return isoparse(dt)
-        except ValueError as e:
-            raise ParseException(
-                f"expected type {clazz} at {path_to_str(path)}, cannot parse due to {e}"
-            )
+
+        def decode_datetime(value, path, ctx):
+            if not isinstance(value, str):
+                raise _type_error(value, clazz, path)
+            try:
+                pool = ctx.pool
+                if pool is None:
+                    return parse_datetime(value)
+                return _interned(pool, clazz, value, parse_datetime)
+            except ValueError as e:
+                raise ParseException(
+                    LazyMessage(
+                        _path_message,
+                        "expected type {} at {path}, cannot parse due to {}",
+                        path,
+                        clazz,
+                        e,
+                    )
+                )
+
+        return decode_datetime
 
     if clazz is timedelta:
-        dt = __parse_type(value, clazz, path, isinstance(value, str))
-        try:
-            duration = parse_duration(dt)
-            if isinstance(duration, Duration):
+        from isodate import Duration
+
+        def decode_timedelta(value, path, ctx):
+            if not isinstance(value, str):
+                raise _type_error(value, clazz, path)
+            try:
+                pool = ctx.pool
+                if pool is None:
+                    duration = parse_timedelta(value)
+                else:
+                    duration = _interned(pool, clazz, value, parse_timedelta)
+                if isinstance(duration, Duration):
+                    raise ParseException(
+                        "The ISO 8601 duration provided can not contain years or months"
+                    )
+                return duration
+            except ValueError as e:
                 raise ParseException(
-                    "The ISO 8601 duration provided can not contain years or months"
+                    LazyMessage(
+                        _path_message,
+                        "expected type {} at {path}, cannot parse due to {}",
+                        path,
+                        clazz,
+                        e,
+                    )
                 )
-            return duration
-        except ValueError as e:
-            raise ParseException(
-                f"expected type {clazz} at {path_to_str(path)}, cannot parse due to {e}"
-            )
 
-    if clazz is relativedelta:
-        return __parse_type(value, clazz, path, isinstance(value, relativedelta))
+        return decode_timedelta
 
-    child_failures = []
-    child_successes = []
-    subtype = value.pop("_type", default=None)
-    for child_clazz in sorted(clazz.__subclasses__(), key=lambda c: c.__name__):
-        if is_dataclass(child_clazz) and (
-            subtype is None
-            or f"{child_clazz.__module__}.{child_clazz.__name__}".endswith(subtype)
-        ):
+    relativedelta = loaded("dateutil.relativedelta", "relativedelta")
+    if relativedelta is not None and clazz is relativedelta:
+
+        def decode_relativedelta(value, path, ctx):
+            if isinstance(value, relativedelta):
+                pool = ctx.pool
+                if pool is None:
+                    return value
+                return _interned(pool, clazz, value, lambda value: value)
+            raise _type_error(value, clazz, path)
+
+        return decode_relativedelta
+
+    return __build_subclass_decoder(clazz, codegen)
+
+
+# common ISO 8601 forms are built directly, anything else goes through the general parsers
+_ISO_DATETIME = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})"
+    r"(?:[T ]([01]\d|2[0-3]):(\d{2})(?::(\d{2})(?:\.(\d{1,6}))?)?(Z|[+-]\d{2}:\d{2})?)?"
+)
+_ISO_DURATION = re.compile(r"P(?:(\d+)D)?(?:T(?=\d)(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?")
+
+
+def _iso_datetime(value: str) -> Optional[datetime]:
+    match = _ISO_DATETIME.fullmatch(value)
+    if match is None:
+        return None
+    year, month, day, hour, minute, second, fraction, offset = match.groups()
+
+    tzinfo = None
+    if offset is not None:
+        from dateutil import tz
+
+        hours, minutes = (
+            (0, 0) if offset == "Z" else (int(offset[1:3]), int(offset[4:]))
+        )
+        if hours == 0 and minutes == 0:
+            tzinfo = tz.UTC
+        elif hours > 23 or minutes > 59:
+            return None
+        else:
+            seconds = (hours * 60 + minutes) * 60
+            tzinfo = tz.tzoffset(None, -seconds if offset[0] == "-" else seconds)
+
+    try:
+        return datetime(
+            int(year),
+            int(month),
+            int(day),
+            int(hour or 0),
+            int(minute or 0),
+            int(second or 0),
+            int(fraction.ljust(6, "0")) if fraction else 0,
+            tzinfo,
+        )
+    except ValueError:
+        # out of range fields, reported by the general parser
+        return None
+
+
+@lru_cache(maxsize=1024)
+def parse_datetime(value: str) -> datetime:
+    """isoparse memoized, literals are shared between calls as datetimes are immutable."""
+    parsed = _iso_datetime(value)
+    if parsed is not None:
+        return parsed
+
+    from dateutil.parser import isoparse
+
+    return isoparse(value)
+
+
+@lru_cache(maxsize=1024)
+def parse_timedelta(value: str) -> Any:
+    """isodate.parse_duration memoized, Durations with years or months are returned as is."""
+    match = _ISO_DURATION.fullmatch(value)
+    if match is not None and value != "P":
+        days, hours, minutes, seconds = match.groups()
+        return timedelta(
+            days=int(days or 0),
+            hours=int(hours or 0),
+            minutes=int(minutes or 0),
+            seconds=int(seconds or 0),
+        )
+
+    from isodate import parse_duration
+
+    return parse_duration(value)
+
+
+@lru_cache(maxsize=1024)
+def _parse_path(clazz: Type, value: str) -> Path:
+    return clazz(value)
+
+
+def parse_path(clazz: Type, value: Any) -> Path:
+    """clazz(value) memoized for strings, paths are immutable and shared between calls."""
+    if value.__class__ is str:
+        return _parse_path(clazz, value)
+    return clazz(value)
+
+
+def scalar_cache_clear() -> None:
+    parse_datetime.cache_clear()
+    parse_timedelta.cache_clear()
+    _parse_path.cache_clear()
+
+
+def _interned(pool: Dict[Any, Any], clazz: Type, value: Any, parse: Callable) -> Any:
+    """Parse value into clazz once per decode, keyed by the value it is parsed from."""
+    key = (clazz, value)
+    parsed = pool.get(key, MISSING)
+    if parsed is MISSING:
+        parsed = pool[key] = parse(value)
+    return parsed
+
+
+class SubclassIndex:
+    """Candidate subclasses of a base class, resolved by _type suffix and by keys.
+
+    A subclass cannot decode a mapping missing one of its required fields, nor one
+    with keys it does not accept unless unexpected keys are ignored. Candidates are
+    computed once per _type and key set and cached.
+    """
+
+    max_signatures = 1024
+
+    def __init__(self, subclasses: List[Type]) -> None:
+        self.subclasses = subclasses
+        self.children = [
+            child
+            for child in sorted(subclasses, key=lambda c: c.__name__)
+            if is_dataclass(child)
+        ]
+        self.by_type: Dict[Optional[str], List[Type]] = {None: self.children}
+        self.by_signature: Dict[Tuple, List[Type]] = {}
+
+    def typed(self, subtype: Optional[str]) -> List[Type]:
+        children = self.by_type.get(subtype)
+        if children is None:
+            children = self.by_type[subtype] = [
+                child
+                for child in self.children
+                if f"{child.__module__}.{child.__name__}".endswith(subtype)
+            ]
+        return children
+
+    def candidates(
+        self, subtype: Optional[str], keys: Any, ignore_unexpected: bool
+    ) -> List[Type]:
+        signature = (subtype, frozenset(keys).difference(("_type",)), ignore_unexpected)
+        children = self.by_signature.get(signature)
+        if children is None:
+            children = [
+                child
+                for child in self.typed(subtype)
+                if self.accepts(compile_decoder(child), signature[1], ignore_unexpected)
+            ]
+            if len(self.by_signature) >= self.max_signatures:
+                self.by_signature.clear()
+            self.by_signature[signature] = children
+        return children
+
+    @staticmethod
+    def accepts(decoder: "DataclassDecoder", keys: frozenset, ignore_unexpected: bool):
+        return all(
+            name in keys or alias in keys for name, alias in decoder.required
+        ) and (ignore_unexpected or keys <= decoder.keys.keys())
+
+
+def __build_subclass_decoder(clazz: Type, codegen: bool) -> Decoder:
+    # subclasses can be declared after compilation, the index is rebuilt when they change
+    index = SubclassIndex(clazz.__subclasses__())
+
+    def decode_subclass(value, path, ctx):
+        nonlocal index
+        subclasses = clazz.__subclasses__()
+        if subclasses != index.subclasses:
+            index = SubclassIndex(subclasses)
+
+        subtype = None
+        typed = False
+        if isinstance(value, dict):
+            # values are only read, parsed trees can be shared across decodes
+            typed = dict.__contains__(value, "_type")
+            subtype = dict.get(value, "_type")
+            candidates = index.candidates(subtype, value.keys(), ctx.ignore_unexpected)
+            if len(candidates) == 1:
+                try:
+                    return compile_decoder(candidates[0], codegen)(
+                        value, path, ctx, typed
+                    )
+                except (
+                    TypeConfigException,
+                    MalformedConfigException,
+                    UnexpectedKeysException,
+                    AmbiguousSubclassException,
+                ):
+                    # every subclass fails, trial parse them all to report why
+                    pass
+
+        child_failures = []
+        child_successes = []
+        for child_clazz in index.typed(subtype):
             try:
                 child_successes.append(
                     (
                         child_clazz,
-                        __parse(value, child_clazz, path, strict, ignore_unexpected),
+                        compile_decoder(child_clazz, codegen)(value, path, ctx, typed),
                     )
                 )
             except (
@@ -312,27 +1206,354 @@ def __parse(value: any, clazz: Type, path: str, strict: bool, ignore_unexpected:
             ) as e:
                 child_failures.append(e)
 
-    if len(child_successes) == 1:
-        return child_successes[0][1]
-    elif len(child_successes) > 1:
-        matching_classes = "\n- ".join(map(lambda x: x[0].__name__, child_successes))
-        raise AmbiguousSubclassException(
-            f"""multiple subtypes of {clazz} matched at {path_to_str(path)}, use '_type' to disambiguate:\n- {matching_classes}"""
+        if len(child_successes) == 1:
+            return child_successes[0][1]
+        elif len(child_successes) > 1:
+            matching_classes = "\n- ".join(
+                map(lambda x: x[0].__name__, child_successes)
+            )
+            raise AmbiguousSubclassException(
+                LazyMessage(
+                    _path_message,
+                    "multiple subtypes of {} matched at {path}, use '_type' to disambiguate:\n- {}",
+                    path,
+                    clazz,
+                    matching_classes,
+                )
+            )
+
+        # no need to check length; false if empty
+        if child_failures:
+            raise TypeConfigException(
+                LazyMessage(_subclasses_message, clazz, path, child_failures)
+            )
+
+        raise _type_error(value, clazz, path)
+
+    return decode_subclass
+
+
+# item types of lists decoded in bulk, with the value types their decoders accept as is
+_NUMBERS: Dict[Type, FrozenSet[Type]] = {
+    int: frozenset((int, bool)),
+    float: frozenset((float, int, bool)),
+}
+_TYPECODES = {int: "q", float: "d"}
+_DTYPES = {int: "int64", float: "float64", bool: "bool"}
+
+
+def _numbers(value: Any, clazz: Type, ctx: ParseContext) -> Optional[List[Any]]:
+    """Decode a list of numbers at once, None when some items need their decoder."""
+    types = set(map(type, value))
+    if not types <= _NUMBERS[clazz]:
+        return None
+    if ctx.strict or types <= {clazz}:
+        return list(value)
+    # converted like decode_int and decode_float do when not strict
+    return list(map(clazz, value))
+
+
+def _as_buffer(value: Any) -> Optional[memoryview]:
+    ndarray = loaded("numpy", "ndarray")
+    if isinstance(value, (array, memoryview)) or (
+        ndarray is not None and isinstance(value, ndarray)
+    ):
+        return memoryview(value)
+    return None
+
+
+# memory-mapped sidecar files, {"$mmap": file, "dtype": name} with the struct format of
+# each dtype name
+MMAP = "$mmap"
+_QUOTED_MMAP = f'"{MMAP}"'
+_FORMATS = {
+    "int8": "b",
+    "uint8": "B",
+    "int16": "h",
+    "uint16": "H",
+    "int32": "i",
+    "uint32": "I",
+    "int64": "q",
+    "uint64": "Q",
+    "float32": "f",
+    "float64": "d",
+}
+
+
+def _mmap_key(value: Dict[Any, Any]) -> Optional[str]:
+    # HOCON keeps the quotes of keys with special characters
+    return MMAP if MMAP in value else _QUOTED_MMAP if _QUOTED_MMAP in value else None
+
+
+def resolve_sidecar(value: Dict[Any, Any], base: str) -> None:
+    """Join a relative file of the sidecar reference value to the base directory."""
+    key = _mmap_key(value)
+    if key is None:
+        return
+    file = dict.__getitem__(value, key)
+    if isinstance(file, str) and not os.path.isabs(file):
+        dict.__setitem__(value, key, os.path.join(base, file))
+
+
+def resolve_sidecars(conf: Any, base: str) -> Any:
+    """Join the relative files of the sidecar references in conf to the base directory.
+
+    Loaders call it with the directory of the config file, so that sidecar files are
+    found next to it whatever the working directory. Conf is updated in place.
+    """
+    stack = [conf]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            resolve_sidecar(value, base)
+            value = value.values()
+        elif not isinstance(value, list):
+            continue
+        stack.extend(v for v in value if isinstance(v, (dict, list)))
+    return conf
+
+
+def _mmap(value: Any, path: KeyPath, default: str) -> Optional[memoryview]:
+    """Read-only view of the sidecar file referenced by value, None for other values.
+
+    The file is mapped shared, its pages are loaded on access and shared between the
+    processes mapping it. Relative files of config files are resolved from the directory
+    of the config (see resolve_sidecars), other ones from the working directory. Items
+    are in native byte order with default as the format when no dtype is given.
+    """
+    if not isinstance(value, dict):
+        return None
+    key = _mmap_key(value)
+    if key is None:
+        return None
+
+    unexpected_keys = value.keys() - {key, "dtype"}
+    if len(unexpected_keys) > 0:
+        raise UnexpectedKeysException(
+            LazyMessage(
+                _path_message,
+                'unexpected key(s) "{}" detected for {} at {path}',
+                path,
+                ", ".join(unexpected_keys),
+                MMAP,
+            )
+        )
+    dtype = value.get("dtype", None)
+    fmt = default if dtype is None else _FORMATS.get(dtype)
+    if fmt is None:
+        raise MalformedConfigException(
+            LazyMessage(
+                _path_message,
+                "unsupported dtype {} at {path}, expected one of {}",
+                path,
+                dtype,
+                ", ".join(_FORMATS),
+            )
         )
 
-    # no need to check length; false if empty
-    if child_failures:
-        failures = "\n- ".join([str(c) for c in child_failures])
-        raise TypeConfigException(
-            f"expected type {clazz} at {path_to_str(path)}, failed subclasses:\n- {failures}"
+    with open(value[key], "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files cannot be mapped
+            mapped = b""
+    try:
+        return memoryview(mapped).cast(fmt)
+    except TypeError as e:
+        raise MalformedConfigException(
+            LazyMessage(
+                _path_message,
+                "cannot map {} as {} at {path} due to {}",
+                path,
+                value[key],
+                dtype or fmt,
+                e,
+            )
         )
 
-    raise TypeConfigException(
-        f"expected type {clazz} at {path_to_str(path)}, got {type(value)}"
+
+def _overflow_error(target: str, path: KeyPath, e: OverflowError):
+    return TypeConfigException(
+        LazyMessage(
+            _path_message,
+            "expected values fitting an {} at {path}, got {}",
+            path,
+            target,
+            e,
+        )
+    )
+
+
+def __build_array_decoder(item: Type, codegen: bool) -> Decoder:
+    typecode = _TYPECODES.get(item)
+    if typecode is None:
+
+        def decode_untyped_array(value, path, ctx):
+            raise MissingTypeException(
+                "expected array of int or float: Annotated[List[?], array]"
+            )
+
+        return decode_untyped_array
+
+    decode_list = compile_decoder(List[item], codegen)
+
+    def decode_array(value, path, ctx):
+        view = _mmap(value, path, typecode)
+        if view is None:
+            view = _as_buffer(value)
+        if view is not None:
+            if isinstance(value, array) and value.typecode == typecode:
+                # already the expected buffer, shared as is
+                return value
+            if view.format == typecode and view.ndim == 1 and view.c_contiguous:
+                decoded = array(typecode)
+                decoded.frombytes(view.cast("B"))
+                return decoded
+            value = view.tolist()
+        try:
+            return array(typecode, decode_list(value, path, ctx))
+        except OverflowError as e:
+            raise _overflow_error(f"array('{typecode}')", path, e)
+
+    return decode_array
+
+
+def __build_ndarray_decoder(dtype: Any, codegen: bool) -> Decoder:
+    numpy = sys.modules["numpy"]
+    dtype = None if dtype is None else numpy.dtype(dtype)
+    item = {"b": bool, "i": int, "u": int, "f": float}.get(
+        getattr(dtype, "kind", None), Any
     )
+    decode_list = compile_decoder(List[item], codegen)
+
+    default = "d" if dtype is None else _FORMATS.get(dtype.name, "d")
+
+    def decode_ndarray(value, path, ctx):
+        view = _mmap(value, path, default)
+        if view is not None:
+            value = view
+        if _as_buffer(value) is not None:
+            decoded = numpy.asarray(value)
+            if dtype is None or decoded.dtype == dtype:
+                # no copy, the array shares the memory of value
+                return decoded
+            if numpy.can_cast(decoded.dtype, dtype, "safe"):
+                return decoded.astype(dtype)
+            value = decoded.tolist()
+        try:
+            return numpy.array(decode_list(value, path, ctx), dtype=dtype)
+        except OverflowError as e:
+            raise _overflow_error(f"ndarray of {dtype}", path, e)
+
+    return decode_ndarray
+
+
+def may_decode(clazz: Type, value_type: Type, strict: bool) -> bool:
+    """Whether the decoder of clazz may accept a value of value_type.
+
+    False only when the decoder surely fails, letting unions skip members. Types
+    whose decoders convert their values or that are not screened are always tried.
+    """
+    origin = get_origin(clazz)
+    args = get_args(clazz)
+
+    if is_dataclass(clazz):
+        return issubclass(value_type, dict)
+    if origin in (list, tuple) and len(args) > 0:
+        return value_type is NoneType or hasattr(value_type, "__iter__")
+    if origin is dict and len(args) == 2:
+        return value_type is NoneType or hasattr(value_type, "items")
+    if clazz in (str, datetime, timedelta):
+        return issubclass(value_type, str)
+    if clazz is bool:
+        return not strict or issubclass(value_type, bool)
+    if clazz is int:
+        return not strict or issubclass(value_type, int)
+    if clazz is float:
+        return not strict or issubclass(value_type, (int, float))
+    if isclass(clazz) and issubclass(clazz, Enum) and not issubclass(clazz, str):
+        return issubclass(value_type, (int, str))
+    return True
+
+
+_HOCON_KEY_CHARS = re.compile(r'[$}\[\]:=+#`^?!@*&."]')
+
+
+def __requires_tree(value: Any) -> bool:
+    """Whether keys of a plain value need HOCON key parsing (e.g. dotted keys)."""
+    if is_config_tree(value):
+        return False
+
+    if isinstance(value, dict):
+        for k, v in value.items():
+            # sidecar references would lose their $ as HOCON keys
+            if k == MMAP:
+                continue
+            if not isinstance(k, str) or not k or _HOCON_KEY_CHARS.search(k):
+                return True
+            if __requires_tree(v):
+                return True
+        return False
+
+    if isinstance(value, list):
+        return any(__requires_tree(v) for v in value)
+
+    return False
+
+
+def __merge_configs(confs: List[Any]) -> Any:
+    """Deep merge configs from lowest to highest priority in one pass, without mutating them.
+
+    Like folding ConfigTree.merge_configs over the configs, nested mappings are merged and
+    any other value overrides. Each merged mapping is built once, as a ConfigTree when one
+    of its sources is, mappings found in a single config are shared.
+    """
+    config_tree = loaded("pyhocon.config_tree", "ConfigTree")
+
+    def merge(values: List[Any]) -> Any:
+        # the last value that is not a mapping overrides everything below it
+        start = len(values) - 1
+        while start >= 0 and isinstance(values[start], dict):
+            start -= 1
+        if start == len(values) - 1:
+            return values[-1]
+
+        mappings = values[start + 1 :]
+        if len(mappings) == 1:
+            return mappings[0]
+
+        children: Dict[Any, List[Any]] = {}
+        for mapping in mappings:
+            for k, v in mapping.items():
+                layers = children.get(k)
+                if layers is None:
+                    children[k] = [v]
+                else:
+                    layers.append(v)
+
+        merged = {k: merge(layers) for k, layers in children.items()}
+        if config_tree is not None and any(
+            isinstance(m, config_tree) for m in mappings
+        ):
+            return config_tree(merged)
+        return merged
+
+    if len(confs) > 1:
+        # empty documents are empty layers, no other value may override the layers below
+        confs = [{} if conf is None else conf for conf in confs]
+        for conf in confs:
+            if not isinstance(conf, dict):
+                raise MalformedConfigException(
+                    f"expected a mapping for each merged config, got {type(conf)}"
+                )
+
+    return merge(confs)
 
 
 def __generate(value: object, path: str):
+    from pyhocon.config_tree import ConfigList
+    from pyhocon.config_tree import ConfigTree
+
     if is_dataclass(value):
         tree = {k: __generate(v, f"{path}.{k}") for k, v in asdict(value).items()}
         return ConfigTree(tree)
@@ -412,6 +1633,9 @@ def __env_vars_parse(prefix: str, obj: Dict[str, Any]):
     for k, v in sorted(obj.items(), key=lambda x: x[0]):
         if k.startswith(prefix):
             if k.endswith("_"):
+                from pyhocon import ConfigFactory
+                import pyparsing
+
                 try:
                     v = ConfigFactory.parse_string(v)
                 except pyparsing.ParseBaseException as e:
@@ -426,8 +1650,15 @@ def __env_vars_parse(prefix: str, obj: Dict[str, Any]):
     return ret
 
 
-def path_to_str(path: str) -> str:
-    return path if len(path) > 0 else "root"
+def path_to_str(path: KeyPath) -> str:
+    """Render a path, linked (parent, separator, key) tuples down from a root string."""
+    segments = []
+    while isinstance(path, tuple):
+        path, separator, key = path
+        segments.append(f"{separator}{key}")
+    segments.append(path)
+    rendered = "".join(reversed(segments))
+    return rendered if len(rendered) > 0 else "root"
 
 
 def __cli_parse(argv: List[str]):
@@ -0,0 +1,147 @@
+"""Hot reload of a chain, only the files and urls that changed are parsed again."""
+
+from concurrent.futures import Executor
+import logging
+from threading import Event
+from threading import Thread
+from typing import Any
+from typing import Callable
+from typing import Hashable
+from typing import Optional
+from typing import Type
+
+from dataconf.cache import file_key
+from dataconf.main import _load_path
+from dataconf.main import _load_url
+from dataconf.main import Multi
+from dataconf.main import Source
+from dataconf.utils import DecodeMemo
+
+logger = logging.getLogger(__name__)
+
+
+class Watcher:
+    """Polls the files and urls of a chain and calls back with the config when one changes.
+
+    Files are checked by modification time and size, urls are revalidated with
+    conditional requests through the url cache. Only the sources that changed are parsed
+    again before the chain is merged and decoded, strings, dicts, env vars and cli args
+    are kept as loaded, files allowed to be missing are watched until they appear.
+    Errors (e.g. a file being written) are passed to on_error, or logged without it, on
+    every poll until fixed, the current config is kept meanwhile.
+    """
+
+    def __init__(
+        self,
+        chain: Multi,
+        clazz: Type,
+        callback: Callable[[Any], None],
+        interval: float = 1.0,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        self.clazz = clazz
+        self.callback = callback
+        self.interval = interval
+        self.on_error = on_error
+        self.executor = executor
+        self.strict = chain.strict
+        self.kwargs = chain.kwargs
+        # frozen dataclasses of unchanged subtrees are reused from the previous config
+        self.memo = DecodeMemo()
+
+        self.sources = [_revalidated(conf) for conf in chain.confs]
+        self.versions = [_version(source) for source in self.sources]
+        loaded = Multi(self.sources, self.strict, **self.kwargs)
+        self.confs = loaded.load(executor)
+        self.current = loaded.on(clazz, memo=self.memo)
+
+        self._stopped = Event()
+        self._thread: Optional[Thread] = None
+
+    def poll(self) -> bool:
+        """Reload the changed sources, returns whether the callback was called."""
+        versions = [_version(source) for source in self.sources]
+        pending = [
+            source
+            if isinstance(source, Source)
+            and (source.load is _load_url or version != previous)
+            else conf
+            for source, conf, version, previous in zip(
+                self.sources, self.confs, versions, self.versions
+            )
+        ]
+        chain = Multi(pending, self.strict, **self.kwargs)
+        confs = chain.load(self.executor)
+
+        if all(new is old or new == old for new, old in zip(confs, self.confs)):
+            self.versions = versions
+            return False
+
+        current = chain.on(self.clazz, memo=self.memo)
+        self.confs, self.versions, self.current = confs, versions, current
+        self.callback(current)
+        return True
+
+    def start(self) -> "Watcher":
+        self._thread = Thread(target=self._run, name="dataconf-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "Watcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                if self.on_error is not None:
+                    self.on_error(e)
+                else:
+                    logger.exception(
+                        "reloading the config failed, keeping the current one"
+                    )
+
+
+def _revalidated(conf: Any) -> Any:
+    # urls always go through the url cache, unchanged ones are then not parsed again
+    if isinstance(conf, Source) and conf.load is _load_url:
+        uri, timeout, pure_yaml, _ = conf.args
+        return Source(_load_url, uri, timeout, pure_yaml, True)
+    return conf
+
+
+def _version(conf: Any) -> Optional[Hashable]:
+    if isinstance(conf, Source) and conf.load is _load_path:
+        path, loader = conf.args[:2]
+        try:
+            return file_key(path, loader)
+        except FileNotFoundError:
+            # watched until it appears, missing files are reported on load unless allowed
+            return None
+    return None
+
+
+def watch(
+    chain: Multi,
+    clazz: Type,
+    callback: Callable[[Any], None],
+    interval: float = 1.0,
+    on_error: Optional[Callable[[Exception], None]] = None,
+    executor: Optional[Executor] = None,
+) -> Watcher:
+    """Decode chain into clazz and call back with a new config whenever a source changes.
+
+    The initial config is available as watcher.current, stop the background polling
+    with watcher.stop() or by using the watcher as a context manager.
+    """
+    return Watcher(chain, clazz, callback, interval, on_error, executor).start()
@@ -1,5 +1,9 @@
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
 import mimetypes
+from threading import Thread
 
+import pytest
 from werkzeug.wrappers import Request
 from werkzeug.wrappers import Response
 
@@ -12,3 +16,78 @@ def file_handler(path: str):
         return Response(data, mimetype=mimetypes.guess_type(path)[0])
 
     return handler
+
+
+class ConfigServer(ThreadingHTTPServer):
+    """Config server stand-in answering conditional GETs on keep-alive connections."""
+
+    def __init__(self) -> None:
+        # path -> (body, etag, last modified)
+        self.documents = {}
+        # path -> location answered with a 302
+        self.redirects = {}
+        self.requests = []
+        self.connections = set()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(handler) -> None:
+                self.connections.add(handler.client_address)
+                if handler.path in self.redirects:
+                    self.requests.append((handler.path, 302))
+                    handler.send_response(302)
+                    handler.send_header("Location", self.redirects[handler.path])
+                    handler.send_header("Content-Length", "0")
+                    handler.end_headers()
+                    return
+                if handler.path not in self.documents:
+                    self.requests.append((handler.path, 404))
+                    handler.send_response(404)
+                    handler.send_header("Content-Length", "0")
+                    handler.end_headers()
+                    return
+
+                body, etag, modified = self.documents[handler.path]
+                unchanged = (
+                    etag is not None
+                    and handler.headers.get("If-None-Match") == etag
+                    or etag is None
+                    and modified is not None
+                    and handler.headers.get("If-Modified-Since") == modified
+                )
+                status = 304 if unchanged else 200
+                self.requests.append((handler.path, status))
+                handler.send_response(status)
+                if etag is not None:
+                    handler.send_header("ETag", etag)
+                if modified is not None:
+                    handler.send_header("Last-Modified", modified)
+                if unchanged:
+                    handler.send_header("Content-Length", "0")
+                    handler.end_headers()
+                    return
+                handler.send_header("Content-Length", str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+            def log_message(handler, *args) -> None:
+                pass
+
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.daemon_threads = True
+
+    def url_for(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+
+@pytest.fixture
+def config_server():
+    from dataconf.remote import pool
+
+    server = ConfigServer()
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    pool.clear()
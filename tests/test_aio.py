@@ -0,0 +1,93 @@
+import asyncio
+from dataclasses import dataclass
+import time
+from typing import List
+
+import dataconf
+from dataconf.exceptions import TypeConfigException
+import pytest
+from pytest_httpserver import HTTPServer
+from tests.conftest import file_handler
+from werkzeug.wrappers import Response
+
+
+@dataclass
+class Simple:
+    hello: str
+    foo: List[str]
+
+
+@dataclass
+class A:
+    a: int
+    b: str = "default"
+
+
+class TestAio:
+    def test_sources(self, httpserver: HTTPServer, tmp_path, monkeypatch) -> None:
+        httpserver.expect_request("/simple.json").respond_with_handler(
+            file_handler("confs/simple.json")
+        )
+        expected = Simple(hello="bonjour", foo=["bar"])
+        assert (
+            asyncio.run(dataconf.aio.url(httpserver.url_for("/simple.json"), Simple))
+            == expected
+        )
+        assert asyncio.run(dataconf.aio.load("confs/simple.yaml", Simple)) == expected
+        assert (
+            asyncio.run(dataconf.aio.load("confs/simple.yaml", Simple, stream=True))
+            == expected
+        )
+        assert asyncio.run(dataconf.aio.loads("a = 1", A)) == A(a=1)
+
+        path = tmp_path / "a.hocon"
+        path.write_text("a = 1, b = file")
+        monkeypatch.setenv("AIO_A", "2")
+        chain = (
+            dataconf.aio.multi.dict({"a": 0})
+            .file(str(path))
+            .string("a: 3", loader=dataconf.YAML)
+        )
+        assert asyncio.run(chain.on(A)) == A(a=3, b="file")
+        # env disables the strict mode, values are cast
+        assert asyncio.run(chain.env("AIO").on(A)) == A(a=2, b="file")
+
+        with pytest.raises(TypeConfigException):
+            asyncio.run(dataconf.aio.multi.dict({"a": "2"}).on(A))
+
+    def test_concurrent_and_non_blocking(self) -> None:
+        def slow(request):
+            time.sleep(0.3)
+            return Response("a = 1", mimetype="text/plain")
+
+        server = HTTPServer(threaded=True)
+        server.expect_request("/a.conf").respond_with_handler(slow)
+        server.start()
+        try:
+            uri = server.url_for("/a.conf")
+
+            async def main():
+                ticks = 0
+
+                async def ticker():
+                    nonlocal ticks
+                    while True:
+                        await asyncio.sleep(0.01)
+                        ticks += 1
+
+                task = asyncio.create_task(ticker())
+                start = time.perf_counter()
+                conf = await dataconf.aio.multi.url(uri).url(uri).url(uri).on(A)
+                elapsed = time.perf_counter() - start
+                task.cancel()
+                return conf, elapsed, ticks
+
+            conf, elapsed, ticks = asyncio.run(main())
+        finally:
+            server.clear()
+            server.stop()
+
+        assert conf == A(a=1)
+        # the three urls are fetched concurrently while the loop keeps running
+        assert elapsed < 0.8
+        assert ticks > 10
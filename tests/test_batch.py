@@ -0,0 +1,93 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
+from typing import List
+
+import dataconf
+from dataconf.exceptions import TypeConfigException
+from dataconf.exceptions import UnexpectedKeysException
+import pytest
+
+
+@dataclass
+class Job:
+    name: str
+    retries: int = 0
+    tags: List[str] = field(default_factory=list)
+
+
+JOBS = [Job(name=f"job{i}", retries=i % 3, tags=["a", str(i)]) for i in range(200)]
+
+
+def hocon(job: Job) -> str:
+    return f'name = {job.name}, retries = {job.retries}, tags = [a, "{job.tags[1]}"]'
+
+
+def yaml(job: Job) -> str:
+    return f"name: {job.name}\nretries: {job.retries}\ntags: [a, '{job.tags[1]}']"
+
+
+def json(job: Job) -> str:
+    return f'{{"name": "{job.name}", "retries": {job.retries}, "tags": ["a", "{job.tags[1]}"]}}'
+
+
+class TestBatch:
+    def test_loads_many(self) -> None:
+        assert dataconf.loads_many(map(hocon, JOBS), Job) == JOBS
+        assert dataconf.loads_many(map(yaml, JOBS), Job, loader=dataconf.YAML) == JOBS
+        assert dataconf.loads_many(map(json, JOBS), Job, loader=dataconf.JSON) == JOBS
+        assert dataconf.loads_many([], Job) == []
+
+    def test_iloads_many(self) -> None:
+        consumed = []
+
+        def strings():
+            for job in JOBS:
+                consumed.append(job)
+                yield json(job)
+
+        jobs = dataconf.iloads_many(strings(), Job, loader=dataconf.JSON)
+        assert next(jobs) == JOBS[0]
+        assert len(consumed) == 1
+        assert list(jobs) == JOBS[1:]
+
+    def test_intern(self) -> None:
+        doc = '{"name": "shared name", "tags": ["shared name"]}'
+        first, second = dataconf.loads_many(
+            [doc, doc], Job, loader=dataconf.JSON, intern=True
+        )
+        assert first.tags[0] is first.name
+        assert second.tags[0] is second.name
+        # pools are scoped to a single document
+        assert second.name is not first.name
+
+    def test_executor(self) -> None:
+        with ThreadPoolExecutor(2) as executor:
+            assert (
+                dataconf.loads_many(
+                    map(yaml, JOBS),
+                    Job,
+                    loader=dataconf.YAML,
+                    executor=executor,
+                    chunksize=7,
+                )
+                == JOBS
+            )
+
+        with ProcessPoolExecutor(2) as executor:
+            assert dataconf.loads_many(map(hocon, JOBS), Job, executor=executor) == JOBS
+
+    def test_errors(self) -> None:
+        loader = dataconf.compile(Job)
+        with pytest.raises(TypeConfigException):
+            loader.loads_many(["name: a", "name: [b]"], loader=dataconf.YAML)
+
+        with pytest.raises(UnexpectedKeysException):
+            loader.loads_many(['{"name": "a", "other": 1}'], loader=dataconf.JSON)
+
+        assert loader.loads_many(
+            ['{"name": "a", "other": 1}'],
+            loader=dataconf.JSON,
+            ignore_unexpected=True,
+        ) == [Job(name="a")]
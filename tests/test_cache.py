@@ -0,0 +1,179 @@
+from dataclasses import dataclass
+import os
+from typing import List
+import urllib
+
+import dataconf
+from dataconf import multi
+from pyhocon import ConfigFactory
+import pytest
+
+
+class Base:
+    pass
+
+
+@dataclass
+class ImplOne(Base):
+    name: str
+
+
+@dataclass
+class ImplTwo(Base):
+    name: str
+
+
+@dataclass
+class A:
+    a: Base
+    b: int = 0
+
+
+class TestCache:
+    @pytest.fixture(autouse=True)
+    def clear(self):
+        dataconf.cache_clear()
+        yield
+        dataconf.cache_clear()
+
+    def test_file_cache(self, tmp_path) -> None:
+        path = tmp_path / "conf.hocon"
+        path.write_text("a { _type = ImplTwo, name = test }")
+
+        expected = A(a=ImplTwo(name="test"))
+        assert dataconf.file(str(path), A) == expected
+        assert dataconf.file(str(path), A, cache=True) == expected
+        assert dataconf.file(str(path), A, cache=True) == expected
+        assert multi.file(str(path), cache=True).string("b = 1").on(A) == A(
+            a=ImplTwo(name="test"), b=1
+        )
+        assert dataconf.file(str(path), A, cache=True) == expected
+
+        info = dataconf.cache_info()
+        assert (info.hits, info.misses, info.currsize) == (3, 1, 1)
+
+        path.write_text("a { _type = ImplOne, name = changed }")
+        os.utime(path, ns=(0, 0))
+        assert dataconf.file(str(path), A, cache=True) == A(a=ImplOne(name="changed"))
+        assert dataconf.cache_info().misses == 2
+
+        dataconf.cache_clear()
+        assert dataconf.cache_info() == (0, 0, 128, 0)
+
+    def test_yaml_file_cache(self) -> None:
+        @dataclass
+        class Simple:
+            hello: str
+            foo: List[str]
+
+        first = dataconf.load("confs/simple.yaml", Simple, cache=True)
+        assert dataconf.load("confs/simple.yaml", Simple, cache=True) == first
+        assert dataconf.cache_info().hits == 1
+
+    def test_disk_cache(self, tmp_path, monkeypatch) -> None:
+        @dataclass
+        class B:
+            name: str
+            home: str
+
+        path = tmp_path / "conf.hocon"
+        path.write_text("name = test\nhome = unknown\nhome = ${?DATACONF_TEST_HOME}")
+        cache_dir = tmp_path / "cache"
+
+        monkeypatch.setenv("DATACONF_TEST_HOME", "/home/a")
+        expected = B(name="test", home="/home/a")
+        assert dataconf.load(str(path), B, cache_dir=str(cache_dir)) == expected
+        assert len(os.listdir(cache_dir)) == 1
+
+        def fail(*args, **kwargs):
+            raise AssertionError("parsed despite the disk cache")
+
+        with monkeypatch.context() as m:
+            m.setattr(ConfigFactory, "parse_file", fail)
+            assert dataconf.load(str(path), B, cache_dir=str(cache_dir)) == expected
+
+        monkeypatch.setenv("DATACONF_TEST_HOME", "/home/b")
+        assert dataconf.load(str(path), B, cache_dir=str(cache_dir)) == B(
+            name="test", home="/home/b"
+        )
+        assert len(os.listdir(cache_dir)) == 2
+
+    def test_url_cache(self, config_server, monkeypatch) -> None:
+        server = config_server
+        server.documents["/a.conf"] = (
+            b"a { _type = ImplTwo, name = test }",
+            '"v1"',
+            None,
+        )
+        server.documents["/b.yaml"] = (
+            b"b: 2",
+            None,
+            "Wed, 21 Oct 2015 07:28:00 GMT",
+        )
+        uri = server.url_for("/a.conf")
+
+        expected = A(a=ImplTwo(name="test"))
+        assert dataconf.url(uri, A, cache=True) == expected
+
+        def fail(*args, **kwargs):
+            raise AssertionError("parsed despite an unchanged remote config")
+
+        with monkeypatch.context() as m:
+            m.setattr(ConfigFactory, "parse_string", fail)
+            assert dataconf.url(uri, A, cache=True) == expected
+            # the cached tree itself is returned
+            chain = multi.url(uri, cache=True)
+            assert chain.merge() is chain.merge()
+            assert multi.url(uri, cache=True).url(
+                server.url_for("/b.yaml"), cache=True
+            ).on(A) == A(a=ImplTwo(name="test"), b=2)
+        assert multi.url(server.url_for("/b.yaml"), cache=True).merge() == {"b": 2}
+
+        assert server.requests == [
+            ("/a.conf", 200),
+            ("/a.conf", 304),
+            ("/a.conf", 304),
+            ("/a.conf", 304),
+            ("/b.yaml", 200),
+            ("/b.yaml", 304),
+        ]
+        info = dataconf.url_cache_info()
+        assert (info.hits, info.misses, info.currsize) == (4, 2, 2)
+        # keep-alive connections are reused, the two sources of the chain may be fetched
+        # concurrently on two of them
+        assert len(server.connections) <= 2
+
+        server.documents["/a.conf"] = (
+            b"a { _type = ImplOne, name = new }",
+            '"v2"',
+            None,
+        )
+        assert dataconf.url(uri, A, cache=True) == A(a=ImplOne(name="new"))
+        assert server.requests[-1] == ("/a.conf", 200)
+
+        # without cache the document is always downloaded, still on pooled connections
+        assert dataconf.url(uri, A) == A(a=ImplOne(name="new"))
+        assert server.requests[-1] == ("/a.conf", 200)
+        assert len(server.connections) <= 2
+
+        with pytest.raises(urllib.error.HTTPError):
+            dataconf.url(server.url_for("/missing.conf"), A, cache=True)
+
+        dataconf.cache_clear()
+        assert dataconf.url_cache_info() == (0, 0, 128, 0)
+
+    def test_url_redirects(self, config_server, tmp_path) -> None:
+        server = config_server
+        server.documents["/b.yaml"] = (b"b: 2", None, None)
+        server.redirects["/moved.yaml"] = "/b.yaml"
+        assert multi.url(server.url_for("/moved.yaml")).merge() == {"b": 2}
+
+        secret = tmp_path / "secret.yaml"
+        secret.write_text("b: 3")
+        server.redirects["/local.yaml"] = secret.as_uri()
+        with pytest.raises(urllib.error.HTTPError, match="is not allowed"):
+            multi.url(server.url_for("/local.yaml"), cache=True).merge()
+
+        server.redirects["/loop.yaml"] = "/loop.yaml"
+        with pytest.raises(urllib.error.HTTPError, match="infinite loop"):
+            multi.url(server.url_for("/loop.yaml")).merge()
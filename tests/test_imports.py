@@ -0,0 +1,41 @@
+import subprocess
+import sys
+
+BACKENDS = ("pyhocon", "pyparsing", "yaml", "dateutil", "isodate")
+
+SCRIPT = """
+import sys
+from dataclasses import dataclass
+import dataconf
+
+@dataclass
+class A:
+    a: int
+
+assert dataconf.dict({{"a": 1}}, A) == A(a=1)
+{}
+print(",".join(sorted({{m.split(".")[0] for m in sys.modules}} & set({!r}))))
+"""
+
+
+def imported_backends(statement: str = "") -> set:
+    out = subprocess.run(
+        [sys.executable, "-c", SCRIPT.format(statement, BACKENDS)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(filter(None, out.stdout.strip().split(",")))
+
+
+class TestImports:
+    def test_lazy_backends(self) -> None:
+        assert imported_backends() == set()
+
+    def test_backends_on_first_use(self) -> None:
+        assert imported_backends("dataconf.loads('a: 1', A, loader=dataconf.YAML)") == {
+            "yaml"
+        }
+        assert {"pyhocon", "pyparsing"} <= imported_backends(
+            "dataconf.loads('a = 1', A)"
+        )
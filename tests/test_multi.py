@@ -1,11 +1,19 @@
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 import os
-from typing import Text, Tuple
+import time
+from typing import Any, Dict, List, Text, Tuple
 from datetime import timedelta
 import urllib
 
 from dataconf import multi
+from dataconf import YAML
+from dataconf.exceptions import MalformedConfigException
+from pyhocon import ConfigFactory
+from pyhocon.config_tree import ConfigTree
 import pytest
+from pytest_httpserver import HTTPServer
+from werkzeug.wrappers import Response
 
 
 class TestMulti:
@@ -78,3 +86,158 @@ class TestMulti:
 
         result = multi.file("non_existent.yaml", allow_missing=True).on(A)
         assert result == A(value=42)
+
+    def test_dict_merge(self) -> None:
+        @dataclass
+        class N:
+            b: int
+            c: int
+            d: int
+
+        @dataclass
+        class A:
+            a: N
+            e: List[int]
+
+        first = {"a": {"b": 1, "c": 2}, "e": [1]}
+        second = {"a": {"c": 3, "d": 4}, "e": [2]}
+        assert multi.dict(first).dict(second).on(A) == A(a=N(b=1, c=3, d=4), e=[2])
+        assert first == {"a": {"b": 1, "c": 2}, "e": [1]}
+        assert second == {"a": {"c": 3, "d": 4}, "e": [2]}
+
+        assert multi.dict({"a.b": 1, "a": {"c": 2}}).dict({"a": {"d": 3}, "e": []}).on(
+            A
+        ) == A(a=N(b=1, c=2, d=3), e=[])
+        assert multi.dict(first).string("a { d = 4 }").on(A) == A(
+            a=N(b=1, c=2, d=4), e=[1]
+        )
+
+    def test_lazy_sources(self, tmp_path) -> None:
+        @dataclass
+        class A:
+            a: int
+            b: Text
+
+        first = tmp_path / "first.hocon"
+        second = tmp_path / "second.yaml"
+        chain = multi.file(str(first)).file(str(second)).string("b = last")
+
+        # sources are only fetched and parsed on merge
+        with pytest.raises(FileNotFoundError):
+            chain.on(A)
+
+        first.write_text("a = 1, b = first")
+        second.write_text("a: 2")
+        assert chain.on(A) == A(a=2, b="last")
+
+        with ProcessPoolExecutor(2) as executor:
+            assert multi.file(str(first)).file(str(second)).on(A, executor) == A(
+                a=2, b="first"
+            )
+
+    def test_empty_layers(self, tmp_path) -> None:
+        @dataclass
+        class A:
+            name: Text
+            port: int = 80
+
+        (tmp_path / "base.hocon").write_text("name = svc")
+        (tmp_path / "empty.yaml").write_text("# nothing to override\n")
+        (tmp_path / "top.yaml").write_text("port: 81")
+        chain = multi.file(str(tmp_path / "base.hocon")).file(
+            str(tmp_path / "empty.yaml")
+        )
+        assert chain.file(str(tmp_path / "top.yaml")).on(A) == A(name="svc", port=81)
+        assert chain.on(A) == A(name="svc")
+
+        with pytest.raises(MalformedConfigException):
+            multi.string("name = svc").string("[1]", loader=YAML).on(A)
+
+    def test_concurrent_sources(self) -> None:
+        @dataclass
+        class A:
+            a: int
+            b: int
+
+        def slow(request):
+            time.sleep(0.3)
+            return Response(f"{request.args['k']} = 1", mimetype="text/plain")
+
+        server = HTTPServer(threaded=True)
+        server.expect_request("/conf").respond_with_handler(slow)
+        server.start()
+        try:
+            chain = (
+                multi.url(server.url_for("/conf?k=a"))
+                .url(server.url_for("/conf?k=b"))
+                .url(server.url_for("/conf?k=a"))
+            )
+            start = time.perf_counter()
+            assert chain.on(A) == A(a=1, b=1)
+            assert time.perf_counter() - start < 0.8
+        finally:
+            server.clear()
+            server.stop()
+
+    def test_source_threads(self, tmp_path, monkeypatch) -> None:
+        from dataconf import main
+
+        pools = []
+        default = main.ThreadPoolExecutor()._max_workers
+
+        class RecordingPool(main.ThreadPoolExecutor):
+            def __init__(self, *args, **kwargs) -> None:
+                super().__init__(*args, **kwargs)
+                pools.append(self._max_workers)
+
+        monkeypatch.setattr(main, "ThreadPoolExecutor", RecordingPool)
+
+        # strings are parsed inline
+        chain = multi
+        for i in range(300):
+            chain = chain.string(f"a{i} = {i}")
+        assert chain.merge()["a299"] == 299
+        assert pools == []
+
+        # files share a pool of the default size
+        for i in range(300):
+            path = tmp_path / f"{i}.hocon"
+            path.write_text(f"a{i} = {i}")
+            chain = chain.file(str(path))
+        assert chain.merge()["a299"] == 299
+        assert pools == [default]
+
+    def test_layers(self) -> None:
+        @dataclass
+        class A:
+            a: Dict[str, Dict[str, int]]
+            b: Any = None
+
+        layers = [
+            "a { x { n = 0 } }, b = { c = 1 }",
+            {"a": {"x": {"m": 1}, "y": {"n": 1}}},
+            "a.y.n = 2, b = 3",
+            {"a": {"z": {"n": 3}}, "b": {"d": 4}},
+        ]
+        expected = A(
+            a={"x": {"n": 0, "m": 1}, "y": {"n": 2}, "z": {"n": 3}}, b={"d": 4}
+        )
+
+        chain = multi
+        for layer in layers:
+            chain = chain.string(layer) if isinstance(layer, str) else chain.dict(layer)
+        assert chain.on(A) == expected
+
+        trees = chain.load()
+        folded = ConfigTree()
+        for tree in trees:
+            tree = ConfigFactory.from_dict(tree)
+            folded = ConfigTree.merge_configs(folded, tree, copy_trees=True)
+        assert chain.merge() == folded
+        assert trees[0] == {"a": {"x": {"n": 0}}, "b": {"c": 1}}
+
+        # chains are persistent, branches share their common sources
+        base = multi.dict({"a": {"x": {"n": 1}}})
+        assert base.dict({"a": {"x": {"n": 2}}}).on(A) == A(a={"x": {"n": 2}})
+        assert base.dict({"b": 1}).on(A) == A(a={"x": {"n": 1}}, b=1)
+        assert base.on(A) == A(a={"x": {"n": 1}})
@@ -1,3 +1,4 @@
+from array import array
 from dataclasses import dataclass
 from dataclasses import field
 from datetime import datetime
@@ -5,8 +6,12 @@ from datetime import timedelta
 from datetime import timezone
 from enum import Enum
 from enum import IntEnum
+import copy
+import functools
 import os
 from pathlib import Path
+import sys
+from typing import Annotated
 from typing import Any, Literal
 from typing import Dict
 from typing import List
@@ -28,6 +33,7 @@ from dataconf.main import file
 from dataconf.main import url
 from dateutil.relativedelta import relativedelta
 import pytest
+from pyhocon import ConfigFactory
 from pytest_httpserver import HTTPServer
 from dataconf.version import PY311up
 from tests.conftest import file_handler
@@ -79,6 +85,23 @@ class AmbigImplTwo(AmbigImplBase):
     bar: str
 
 
+@dataclass(frozen=True)
+class SlotsLimits:
+    cpu: int
+    memory: int = 512
+
+
+@dataclass
+class SlotsTenant:
+    name: str
+    limits: SlotsLimits
+    input: InputType
+    tags: List[str] = field(default_factory=list)
+
+    def describe(self) -> str:
+        return f"{self.name}: {self.input.test_method()}"
+
+
 class TestParser:
     def test_simple(self) -> None:
         @dataclass
@@ -204,6 +227,102 @@ class TestParser:
             "expected one of <class 'tests.test_parse.TestParser.test_union.<locals>.B'>, <class 'str'>, <class 'int'> at .b, got <class 'float'>"
         )
 
+    def test_union_screening(self) -> None:
+        @dataclass
+        class B:
+            a: Text
+
+        @dataclass
+        class A:
+            b: List[Union[int, Text, List[int], Dict[str, B]]]
+
+        conf = {"b": [1, "x", [2, 3], {"k": {"a": "y"}}, True]}
+        assert dataconf.dict(conf, A) == A(b=[1, "x", [2, 3], {"k": B(a="y")}, True])
+        assert dataconf.parse({"b": ["1"]}, A, strict=False) == A(b=[1])
+
+        with pytest.raises(TypeConfigException) as e:
+            dataconf.dict({"b": [1.5]}, A)
+        message = e.value.args[0]
+        assert message == (
+            "expected one of <class 'int'>, <class 'str'>, typing.List[int], "
+            "typing.Dict[str, tests.test_parse.TestParser.test_union_screening.<locals>.B] "
+            "at .b[], got <class 'float'>"
+        )
+        assert str(e.value) == message
+        assert type(message) is str
+        assert ".b[]" in message and message.startswith("expected one of")
+
+        @dataclass
+        class C:
+            c: Union[List[int], int]
+
+        assert dataconf.dict({"c": 1}, C) == C(c=1)
+
+        # values screened out of every member are not taken as missing optional values
+        @dataclass
+        class D:
+            ports: Optional[List[int]]
+
+        assert dataconf.dict({"ports": [80]}, D) == D(ports=[80])
+        for ports in (8080, True, 1.5):
+            with pytest.raises(TypeConfigException, match=r"at \.ports, got"):
+                dataconf.dict({"ports": ports}, D)
+        with pytest.raises(TypeConfigException):
+            dataconf.string("ports = 8080", D)
+
+    def test_error_messages_are_str(self) -> None:
+        import json
+        import pickle
+
+        class Color(Enum):
+            RED = 1
+
+        @dataclass
+        class B:
+            c: int
+
+        @dataclass
+        class A:
+            b: B
+            at: Optional[datetime] = None
+            color: Color = Color.RED
+            u: Union[int, List[int]] = 0
+
+        for conf, exception in (
+            ({"b": {"c": "x"}}, TypeConfigException),
+            ({"b": {}}, MalformedConfigException),
+            ({"b": {"c": 1, "d": 2}}, UnexpectedKeysException),
+            ({"b": {"c": 1}, "at": "nope"}, ParseException),
+            ({"b": {"c": 1}, "color": []}, TypeConfigException),
+            ({"b": {"c": 1}, "u": "x"}, TypeConfigException),
+        ):
+            with pytest.raises(exception) as e:
+                dataconf.dict(conf, A)
+            assert all(type(arg) is str for arg in e.value.args)
+            assert ".b" in e.value.args[0] or "at ." in e.value.args[0]
+            json.dumps(e.value.args)
+            assert pickle.loads(pickle.dumps(e.value)).args == e.value.args
+
+    def test_error_path(self) -> None:
+        @dataclass
+        class B:
+            c: Dict[str, List[int]]
+
+        @dataclass
+        class A:
+            b: B
+
+        with pytest.raises(TypeConfigException) as e:
+            dataconf.dict({"b": {"c": {"d": [1, "x"]}}}, A)
+        assert (
+            e.value.args[0]
+            == "expected type <class 'int'> at .b.c.d[], got <class 'str'>"
+        )
+
+        with pytest.raises(TypeConfigException) as e:
+            dataconf.dict([], A)
+        assert str(e.value).endswith("at root, got <class 'list'>")
+
     def test_optional(self) -> None:
         @dataclass
         class A:
@@ -366,6 +485,41 @@ class TestParser:
         with pytest.raises(ParseException):
             assert loads(conf, A)
 
+    def test_memoized_scalars(self) -> None:
+        from dataconf import utils
+        from dateutil.parser import isoparse
+        from isodate import parse_duration
+
+        @dataclass
+        class A:
+            at: datetime
+            every: timedelta
+            dir: Path
+
+        conf = {"at": "2024-03-01T00:00:00.25+05:30", "every": "PT5M", "dir": "/srv"}
+        dataconf.cache_clear()
+        a = dataconf.dict(conf, A)
+        assert a == A(
+            isoparse(conf["at"]), parse_duration(conf["every"]), Path(conf["dir"])
+        )
+        assert a.at.tzinfo is isoparse(conf["at"]).tzinfo
+
+        # the same literals are converted once and shared between decodes
+        b = dataconf.dict(conf, A)
+        assert b.at is a.at and b.every is a.every and b.dir is a.dir
+        assert utils.parse_datetime.cache_info().hits == 1
+
+        # forms outside of the fast paths go through the general parsers
+        assert utils.parse_datetime("2024-03-01T24:00") == datetime(2024, 3, 2)
+        assert utils.parse_datetime("20240301T0830Z") == isoparse("20240301T0830Z")
+        assert utils.parse_timedelta("PT1.5S") == timedelta(seconds=1.5)
+        with pytest.raises(ParseException):
+            dataconf.dict({**conf, "at": "2024-02-30"}, A)
+
+        dataconf.cache_clear()
+        assert utils.parse_datetime.cache_info().currsize == 0
+        assert dataconf.dict(conf, A).at is not a.at
+
     def test_optional_with_default(self) -> None:
         @dataclass
         class A:
@@ -431,6 +585,25 @@ class TestParser:
         }
         """
         assert loads(conf, A) == A(b="c")
+        assert loads(conf, A, loader=dataconf.JSON) == A(b="c")
+
+    def test_json_loader(self, monkeypatch) -> None:
+        @dataclass
+        class A:
+            b: Dict[str, int]
+
+        # keys are not HOCON paths
+        conf = '{"b": {"c.d": 1}}'
+        assert loads(conf, A, loader=dataconf.JSON) == A(b={"c.d": 1})
+
+        with pytest.raises(MalformedConfigException):
+            loads('{"b": ', A, loader=dataconf.JSON)
+
+        # fallback to the standard library without orjson
+        monkeypatch.setitem(sys.modules, "orjson", None)
+        assert loads(conf, A, loader=dataconf.JSON) == A(b={"c.d": 1})
+        with pytest.raises(MalformedConfigException):
+            loads('{"b": ', A, loader=dataconf.JSON)
 
     def test_default_value(self) -> None:
         @dataclass
@@ -672,6 +845,71 @@ class TestParser:
         conf = loads(unambig_str_conf, Base)
         assert isinstance(conf.foo, AmbigImplTwo)
 
+    def test_traits_index(self) -> None:
+        class Plugin:
+            pass
+
+        @dataclass
+        class Http(Plugin):
+            url: Text
+            timeout: int = 10
+
+        @dataclass
+        class File(Plugin):
+            path: Text
+            mode: Optional[Text] = None
+
+        @dataclass
+        class Base:
+            plugins: List[Plugin]
+
+        conf = dataconf.dict(
+            {"plugins": [{"url": "a"}, {"path": "b", "mode": "r"}, {"url": "c"}]}, Base
+        )
+        assert conf == Base(
+            plugins=[Http(url="a"), File(path="b", mode="r"), Http(url="c")]
+        )
+
+        # subclasses declared after the first parse are candidates too
+        @dataclass
+        class Url(Plugin):
+            url: Text
+            auth: Text
+
+        conf = dataconf.dict({"plugins": [{"url": "a", "auth": "x"}]}, Base)
+        assert conf == Base(plugins=[Url(url="a", auth="x")])
+
+        with pytest.raises(AmbiguousSubclassException):
+            dataconf.dict(
+                {"plugins": [{"url": "a", "auth": "x"}]}, Base, ignore_unexpected=True
+            )
+
+        with pytest.raises(TypeConfigException) as e:
+            dataconf.dict({"plugins": [{"url": 1}]}, Base)
+        assert e.value.args[0] == (
+            "expected type <class 'tests.test_parse.TestParser.test_traits_index.<locals>.Plugin'> at .plugins[], failed subclasses:\n"
+            "- expected type <class 'tests.test_parse.TestParser.test_traits_index.<locals>.File'> at .plugins[], no field \"path\" found\n"
+            "- expected type <class 'str'> at .plugins[].url, got <class 'int'>\n"
+            "- expected type <class 'str'> at .plugins[].url, got <class 'int'>"
+        )
+
+    def test_traits_shared_tree(self) -> None:
+        @dataclass
+        class Base:
+            foo: AmbigImplBase
+
+        conf = ConfigFactory.parse_string("foo { _type = AmbigImplTwo, bar = Baz }")
+        expected = Base(foo=AmbigImplTwo(bar="Baz"))
+        for loader in (dataconf.compile(Base), dataconf.compile(Base, codegen=True)):
+            # the discriminator is only read, the tree can be decoded again
+            assert loader.parse(conf) == expected
+            assert loader.parse(conf) == expected
+        assert conf == {"foo": {"_type": "AmbigImplTwo", "bar": "Baz"}}
+
+        with pytest.raises(TypeConfigException) as e:
+            dataconf.dict({"foo": {"_type": "AmbigImplTwo", "bar": "a", "c": 1}}, Base)
+        assert 'unexpected key(s) "c" detected' in e.value.args[0]
+
     def test_any(self) -> None:
         @dataclass
         class Base:
@@ -817,6 +1055,11 @@ class TestParser:
         assert file("confs/simple.yaml", A) == expected
         assert load("confs/simple.yaml", A) == expected
         assert load("confs/simple.yaml", A, loader=dataconf.YAML) == expected
+        assert load("confs/simple.yaml", A, pure_yaml=True) == expected
+        assert (
+            loads("hello: bonjour\nfoo: [bar]", A, loader=dataconf.YAML, pure_yaml=True)
+            == expected
+        )
 
     def test_yaml_url(self, httpserver: HTTPServer) -> None:
         @dataclass
@@ -840,6 +1083,9 @@ class TestParser:
             foo: List[str]
 
         assert file("confs/simple.json", A) == A(hello="bonjour", foo=["bar"])
+        assert file("confs/simple.json", A, loader=dataconf.HOCON) == A(
+            hello="bonjour", foo=["bar"]
+        )
 
     def test_json_url(self, httpserver: HTTPServer) -> None:
         @dataclass
@@ -975,3 +1221,447 @@ class TestParser:
             literal: "d"
             """
             loads(config_string, Something, loader=dataconf.YAML)
+
+    def test_compile(self) -> None:
+        @dataclass
+        class B:
+            c: Text
+
+        @dataclass
+        class A:
+            b: List[B]
+            d: int = 1
+
+        loader = dataconf.compile(A)
+        assert loader.decoder is dataconf.compile(A).decoder
+
+        expected = A(b=[B(c="test")], d=2)
+        assert loader.loads("b = [{ c = test }]\nd = 2") == expected
+        assert loader.dict({"b": [{"c": "test"}], "d": 2}) == expected
+        assert loader.on(dataconf.multi.string("b = []").string("d = 3")) == A(
+            b=[], d=3
+        )
+
+        with pytest.raises(UnexpectedKeysException):
+            loader.dict({"b": [], "e": 1})
+
+        assert dataconf.compile(A, ignore_unexpected=True).dict({"b": [], "e": 1}) == A(
+            b=[]
+        )
+
+    def test_compile_bounded(self, monkeypatch) -> None:
+        from dataclasses import make_dataclass
+        import gc
+        import weakref
+
+        from dataconf import utils
+
+        monkeypatch.setattr(utils, "_MAX_COMPILED", 16)
+        first = make_dataclass("Tenant0", [("cpu", int)])
+        first_ref = weakref.ref(first)
+        assert dataconf.dict({"cpu": 1}, first, slots=True).cpu == 1
+        del first
+
+        # classes created at runtime are not kept alive by the caches
+        for i in range(1, 64):
+            tenant = make_dataclass(f"Tenant{i}", [("cpu", int)])
+            assert dataconf.dict({"cpu": i}, tenant, slots=True).cpu == i
+        assert len(utils._decoders) <= 16
+        assert len(utils._slotted) <= 16
+        gc.collect()
+        assert first_ref() is None
+
+    def test_compile_codegen(self) -> None:
+        @dataclass
+        class B:
+            c: Text
+
+        @dataclass
+        class A:
+            a_b: int
+            b: Optional[B]
+            d: List[B] = field(default_factory=list)
+
+        loader = dataconf.compile(A, codegen=True)
+        assert loader.decoder is not dataconf.compile(A).decoder
+
+        assert loader.loads("a-b = 1\nb { c = test }") == A(a_b=1, b=B(c="test"))
+        assert loader.dict({"a_b": 1, "d": [{"c": "test"}]}) == A(
+            a_b=1, b=None, d=[B(c="test")]
+        )
+
+        with pytest.raises(TypeConfigException):
+            loader.dict({"a_b": "1"})
+
+        with pytest.raises(UnexpectedKeysException):
+            loader.dict({"a_b": 1, "e": 1})
+
+        with pytest.raises(MalformedConfigException):
+            loader.dict({"b": {"c": "test"}})
+
+    def test_decode_memo(self) -> None:
+        @dataclass(frozen=True)
+        class Limits:
+            cpu: int
+            debug: Union[bool, int] = False
+
+        @dataclass(frozen=True)
+        class Service:
+            name: str
+            limits: Limits
+
+        @dataclass(frozen=True)
+        class Config:
+            services: List[Service]
+            default: Limits
+
+        for codegen in (False, True):
+            loader = dataconf.compile(Config, codegen=codegen)
+            memo = dataconf.DecodeMemo()
+            services = [
+                {"name": f"s{i}", "limits": {"cpu": i, "debug": -1}} for i in range(3)
+            ]
+            first = loader.dict(
+                {"services": services, "default": {"cpu": 1}}, memo=memo
+            )
+
+            # a changed config reparsed from scratch, only the changed service is decoded
+            services = copy.deepcopy(services)
+            services[1]["limits"]["cpu"] = 10
+            second = loader.dict(
+                {"services": services, "default": {"cpu": 1}}, memo=memo
+            )
+            assert second.services[1] == Service("s1", Limits(10, -1))
+            assert second.services[0] is first.services[0]
+            assert second.services[2] is first.services[2]
+            assert second.default is first.default
+            assert second.services[1] is not first.services[1]
+
+            # equal hashes or equal values of other types are not reused
+            services = copy.deepcopy(services)
+            services[0]["limits"]["debug"] = -2
+            services[2]["limits"]["debug"] = True
+            third = loader.dict(
+                {"services": services, "default": {"cpu": 1}}, memo=memo
+            )
+            assert third.services[0].limits == Limits(0, -2)
+            assert third.services[2].limits.debug is True
+            assert third.services[1] is second.services[1]
+            # nested instances of a reused instance are carried over
+            fourth = loader.dict(
+                {"services": services, "default": {"cpu": 2}}, memo=memo
+            )
+            assert fourth.services[1].limits is second.services[1].limits
+
+            # failed decodes keep the previous instances
+            with pytest.raises(TypeConfigException):
+                loader.dict({"services": services, "default": {"cpu": "2"}}, memo=memo)
+            assert (
+                loader.dict({"services": services, "default": {"cpu": 2}}, memo=memo)
+                is fourth
+            )
+            assert (
+                loader.parse(
+                    {"services": services, "default": {"cpu": 2}}, False, memo=memo
+                )
+                is not fourth
+            )
+
+            # configs mutated in place are decoded again
+            conf = {"services": services, "default": {"cpu": 2}}
+            fifth = loader.dict(conf, memo=memo)
+            conf["default"]["cpu"] = 3
+            sixth = loader.dict(conf, memo=memo)
+            assert sixth.default == Limits(3)
+            assert sixth.services[0] is fifth.services[0]
+            tree = ConfigFactory.from_dict({"cpu": 1})
+            assert dataconf.parse(tree, Limits, memo=memo) == Limits(1)
+            tree.put("cpu", 2)
+            assert dataconf.parse(tree, Limits, memo=memo) == Limits(2)
+
+        # mutable dataclasses are always decoded again
+        @dataclass
+        class Mutable:
+            cpu: int
+
+        memo = dataconf.DecodeMemo()
+        first = dataconf.parse({"cpu": 1}, Mutable, memo=memo)
+        assert dataconf.parse({"cpu": 1}, Mutable, memo=memo) is not first
+
+    def test_slots(self, tmp_path) -> None:
+        import pickle
+        import weakref
+
+        conf = {
+            "t1": {
+                "name": "a",
+                "limits": {"cpu": 2},
+                "input": {"name": "x", "age": "3"},
+                "tags": ["b"],
+            }
+        }
+        expected = {
+            "t1": SlotsTenant(
+                "a", SlotsLimits(2), StringImpl(name="x", age="3"), tags=["b"]
+            )
+        }
+
+        for codegen in (False, True):
+            loader = dataconf.compile(Dict[str, SlotsTenant], codegen=codegen)
+            tenants = loader.dict(conf, slots=True)
+            assert tenants == expected
+            tenant = tenants["t1"]
+            for value in (tenant, tenant.limits, tenant.input):
+                assert not hasattr(value, "__dict__")
+                assert type(value) is not value.__class__
+            assert isinstance(tenant, SlotsTenant)
+            assert isinstance(tenant.input, InputType)
+            assert repr(tenant) == repr(expected["t1"])
+            assert tenant.describe() == "a: x is 3 years old."
+            assert tenant.input.test_complex() == 9
+            assert hash(tenant.limits) == hash(SlotsLimits(2))
+
+            tenant.name = "b"
+            assert tenant.name == "b"
+            with pytest.raises(AttributeError):
+                tenant.other = 1
+            with pytest.raises(AttributeError):
+                tenant.limits.cpu = 3
+
+            for restored in (pickle.loads(pickle.dumps(tenant)), copy.deepcopy(tenant)):
+                assert restored == tenant
+                assert type(restored) is type(tenant)
+            assert weakref.ref(tenant)() is tenant
+
+        path = tmp_path / "tenant.yaml"
+        path.write_text("name: a\nlimits:\n  cpu: 2\ninput:\n  name: x\n  age: '3'")
+        for stream in (False, True):
+            tenant = dataconf.load(str(path), SlotsTenant, stream=stream, slots=True)
+            assert tenant == SlotsTenant("a", SlotsLimits(2), StringImpl("x", "3"))
+            assert not hasattr(tenant, "__dict__")
+
+        # the default decode still gives plain instances
+        assert type(dataconf.dict(conf["t1"], SlotsTenant)) is SlotsTenant
+
+        # attributes outside of the fields need a __dict__, such classes are kept as is
+        @dataclass
+        class Doubled:
+            value: int
+
+            def __post_init__(self) -> None:
+                self._double = self.value * 2
+
+        @dataclass
+        class Cached(Doubled):
+            @functools.cached_property
+            def triple(self) -> int:
+                return self.value * 3
+
+        @dataclass
+        class Parent:
+            doubled: Doubled
+            cached: Cached
+            limits: SlotsLimits
+
+        parent = dataconf.dict(
+            {"doubled": {"value": 1}, "cached": {"value": 2}, "limits": {"cpu": 1}},
+            Parent,
+            slots=True,
+        )
+        assert not hasattr(parent, "__dict__")
+        assert type(parent.doubled) is Doubled and parent.doubled._double == 2
+        assert type(parent.cached) is Cached and parent.cached.triple == 6
+        assert not hasattr(parent.limits, "__dict__")
+
+    def test_intern(self, tmp_path) -> None:
+        @dataclass
+        class Job:
+            owner: str
+            workdir: Path
+            start: datetime
+            every: timedelta
+            backoff: relativedelta
+            labels: Dict[str, str]
+
+        # every value is a distinct object once parsed
+        job = (
+            '{owner: ops, workdir: /srv/jobs, start: "2024-01-01T00:00:00Z", '
+            "every: PT1H, backoff: 2s, labels: {team: ops}}"
+        )
+        conf = "\n".join(f"j{i}: {job}" for i in range(3))
+
+        for codegen in (False, True):
+            loader = dataconf.compile(Dict[str, Job], codegen=codegen)
+            jobs = list(loader.string(conf, intern=True).values())
+            first = jobs[0]
+            for other in jobs[1:]:
+                assert other.owner is first.owner
+                assert other.workdir is first.workdir
+                assert other.start is first.start
+                assert other.every is first.every
+                assert other.backoff is first.backoff
+                assert next(iter(other.labels)) is next(iter(first.labels))
+                assert other.labels["team"] is first.owner
+
+            assert list(loader.string(conf).values()) == jobs
+
+        path = tmp_path / "paths.yaml"
+        path.write_text("- a/b\n- a/b\n")
+        paths = dataconf.load(str(path), List[Path], stream=True, intern=True)
+        assert paths == [Path("a/b")] * 2
+        assert paths[0] is paths[1]
+
+    def test_numeric_lists(self) -> None:
+        @dataclass
+        class Model:
+            weights: List[float]
+            buckets: List[int]
+            table: array
+            ids: Annotated[List[int], array]
+            scale: Annotated[float, "unit"]
+
+        conf = """
+        weights = [0.5, 1, 2.5]
+        buckets = [1, 2, 3]
+        table = [0.5, 1]
+        ids = [4, 5]
+        scale = 2.0
+        """
+        for codegen in (False, True):
+            loader = dataconf.compile(Model, codegen=codegen)
+            model = loader.string(conf)
+            assert model.weights == [0.5, 1, 2.5]
+            assert type(model.weights) is list
+            assert model.buckets == [1, 2, 3]
+            assert model.table == array("d", [0.5, 1.0])
+            assert model.ids == array("q", [4, 5])
+            assert model.scale == 2.0
+
+            # mixed items go through the item decoders and their errors
+            with pytest.raises(TypeConfigException, match=r"\.buckets\[\]"):
+                loader.string(conf.replace("[1, 2, 3]", "[1, 2.5]"))
+
+        # not strict, items are converted as when decoded one by one
+        assert dataconf.parse([1, True, 2.5], List[float], strict=False) == [
+            1.0,
+            1.0,
+            2.5,
+        ]
+        assert dataconf.parse([1, "2"], List[int], strict=False) == [1, 2]
+
+        # buffers are shared when already of the expected type
+        table = array("d", [1.0, 2.0])
+        assert dataconf.dict({"t": table}, Dict[str, array])["t"] is table
+        assert dataconf.dict({"t": memoryview(table)}, Dict[str, array])["t"] == table
+        assert dataconf.dict({"t": array("i", [1])}, Dict[str, array])["t"] == array(
+            "d", [1]
+        )
+        with pytest.raises(TypeConfigException):
+            dataconf.dict({"t": table}, Dict[str, Annotated[List[int], array]])
+        with pytest.raises(MissingTypeException):
+            dataconf.dict({"t": ["a"]}, Dict[str, Annotated[List[str], array]])
+        with pytest.raises(TypeConfigException, match=r"array\('q'\) at \.t, got"):
+            dataconf.dict({"t": [1, 2**70]}, Dict[str, Annotated[List[int], array]])
+
+    def test_mmap(self, tmp_path, monkeypatch) -> None:
+        @dataclass
+        class Model:
+            raw: memoryview
+            weights: memoryview
+            table: array
+
+        (tmp_path / "weights.f32").write_bytes(array("f", [0.5, 1.5, 2.5]).tobytes())
+        (tmp_path / "table.f64").write_bytes(array("d", [1.0, 2.0]).tobytes())
+        conf = f"""
+        raw {{ "$mmap": "{tmp_path / "weights.f32"}" }}
+        weights {{ "$mmap": "{tmp_path / "weights.f32"}", dtype: float32 }}
+        table {{ "$mmap": "{tmp_path / "table.f64"}" }}
+        """
+        for codegen in (False, True):
+            model = dataconf.compile(Model, codegen=codegen).string(conf)
+            assert model.raw.format == "B" and model.raw.nbytes == 12
+            assert model.weights.readonly
+            assert model.weights.tolist() == [0.5, 1.5, 2.5]
+            assert model.table == array("d", [1.0, 2.0])
+
+        assert dataconf.dict({"raw": b"ab"}, Dict[str, memoryview])["raw"] == b"ab"
+        with pytest.raises(TypeConfigException):
+            dataconf.dict({"raw": "ab"}, Dict[str, memoryview])
+        with pytest.raises(MalformedConfigException, match="cannot map"):
+            dataconf.dict(
+                {"$mmap": str(tmp_path / "weights.f32"), "dtype": "float64"}, memoryview
+            )
+        with pytest.raises(MalformedConfigException, match="unsupported dtype"):
+            dataconf.dict({"$mmap": "weights.f32", "dtype": "float16"}, memoryview)
+        with pytest.raises(UnexpectedKeysException):
+            dataconf.dict({"$mmap": "weights.f32", "offset": 4}, memoryview)
+
+        (tmp_path / "empty.bin").write_bytes(b"")
+        empty = {"$mmap": str(tmp_path / "empty.bin"), "dtype": "int32"}
+        assert dataconf.dict(empty, memoryview).tolist() == []
+
+        # relative files are next to the config file, whatever the working directory
+        confs = {
+            "model.hocon": 'weights { "$mmap": weights.f32, dtype: float32 }',
+            "model.yaml": 'weights:\n  "$mmap": weights.f32\n  dtype: float32',
+            "model.json": '{"weights": {"$mmap": "weights.f32", "dtype": "float32"}}',
+        }
+        for name, content in confs.items():
+            (tmp_path / name).write_text(content)
+        monkeypatch.chdir(tmp_path.parent)
+        for name in confs:
+            path = str(tmp_path / name)
+            for kwargs in ({}, {"cache": True}, {"cache_dir": str(tmp_path / "cache")}):
+                weights = dataconf.file(path, Dict[str, memoryview], **kwargs)
+                assert weights["weights"].tolist() == [0.5, 1.5, 2.5]
+        weights = dataconf.load(
+            str(tmp_path / "model.yaml"), Dict[str, memoryview], stream=True
+        )
+        assert weights["weights"].tolist() == [0.5, 1.5, 2.5]
+        with pytest.raises(FileNotFoundError):
+            dataconf.string(confs["model.hocon"], Dict[str, memoryview])
+
+    def test_numpy_lists(self) -> None:
+        numpy = pytest.importorskip("numpy")
+        from numpy.typing import NDArray
+
+        @dataclass
+        class Model:
+            weights: numpy.ndarray
+            ids: NDArray[numpy.int32]
+            labels: Annotated[List[int], numpy.ndarray]
+
+        model = dataconf.string("weights = [0.5, 1], ids = [1, 2], labels = [3]", Model)
+        assert model.weights.dtype == numpy.float64
+        assert model.weights.tolist() == [0.5, 1.0]
+        assert model.ids.dtype == numpy.int32
+        assert model.labels.dtype == numpy.int64
+
+        weights = numpy.array([1.0, 2.0])
+        ids = numpy.array([1, 2], dtype=numpy.int8)
+        model = dataconf.dict({"weights": weights, "ids": ids, "labels": [3]}, Model)
+        assert model.weights is weights
+        assert model.ids.dtype == numpy.int32 and model.ids.tolist() == [1, 2]
+        with pytest.raises(TypeConfigException):
+            dataconf.dict({"weights": weights, "ids": weights, "labels": []}, Model)
+        with pytest.raises(TypeConfigException, match=r"at \.labels, got"):
+            dataconf.dict({"weights": [], "ids": [], "labels": [2**70]}, Model)
+
+    def test_numpy_mmap(self, tmp_path) -> None:
+        numpy = pytest.importorskip("numpy")
+        from numpy.typing import NDArray
+
+        @dataclass
+        class Model:
+            weights: NDArray[numpy.float32]
+            wide: NDArray[numpy.float64]
+
+        numpy.arange(4, dtype=numpy.float32).tofile(tmp_path / "weights.f32")
+        sidecar = {"$mmap": str(tmp_path / "weights.f32")}
+        model = dataconf.dict(
+            {"weights": sidecar, "wide": {**sidecar, "dtype": "float32"}}, Model
+        )
+        assert model.weights.tolist() == [0.0, 1.0, 2.0, 3.0]
+        assert not model.weights.flags.writeable
+        assert model.weights.base is not None
+        assert model.wide.dtype == numpy.float64
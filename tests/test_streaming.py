@@ -0,0 +1,127 @@
+from dataclasses import dataclass
+from dataclasses import field
+from functools import partial
+import io
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import dataconf
+from dataconf.exceptions import MalformedConfigException
+from dataconf.exceptions import TypeConfigException
+from dataconf.exceptions import UnexpectedKeysException
+from dataconf.streaming import loads
+import pytest
+
+
+@dataclass
+class Backend:
+    host: str
+    port: int = 80
+
+
+@dataclass
+class Route:
+    path: str
+    backends: List[Backend]
+    timeout_ms: Optional[int] = None
+    tags: Tuple[str, ...] = ()
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+ROUTES = """
+defaults: &defaults
+  timeout-ms: 100
+  backends:
+    - host: a.example.com
+routes:
+  api:
+    <<: *defaults
+    path: /api
+    tags: [public, v1]
+  admin:
+    <<: *defaults
+    path: /admin
+    backends:
+      - {host: b.example.com, port: 8080}
+      - &c {host: c.example.com}
+      - *c
+    extra: {a: [1, 2]}
+"""
+
+
+@dataclass
+class Routes:
+    defaults: Dict[str, Any]
+    routes: Dict[str, Route]
+
+
+class TestStreaming:
+    def test_same_as_safe_load(self) -> None:
+        expected = dataconf.loads(ROUTES, Routes, loader=dataconf.YAML)
+        assert loads(io.StringIO(ROUTES), Routes) == expected
+        assert loads(io.StringIO(ROUTES), Routes, pure_yaml=True) == expected
+        assert expected.routes["api"] == Route(
+            path="/api",
+            backends=[Backend(host="a.example.com")],
+            timeout_ms=100,
+            tags=("public", "v1"),
+        )
+        assert expected.routes["admin"].backends[2] == Backend(host="c.example.com")
+
+    def test_file(self, tmp_path) -> None:
+        path = tmp_path / "routes.yaml"
+        path.write_text(ROUTES)
+        expected = dataconf.load(str(path), Routes)
+        assert dataconf.load(str(path), Routes, stream=True) == expected
+        assert dataconf.compile(Routes).load(str(path), stream=True) == expected
+
+        @dataclass
+        class Defaults:
+            routes: Dict[str, Route] = field(default_factory=dict)
+
+        missing = str(tmp_path / "missing.yaml")
+        assert (
+            dataconf.load(missing, Defaults, stream=True, allow_missing=True)
+            == Defaults()
+        )
+        assert (
+            dataconf.compile(Defaults).load(missing, stream=True, allow_missing=True)
+            == Defaults()
+        )
+
+        for load in (
+            partial(dataconf.load, clazz=Routes),
+            dataconf.compile(Routes).load,
+        ):
+            assert load(str(path), stream=True, cache=False) == expected
+            for option in ({"cache": True}, {"cache_dir": str(tmp_path)}):
+                with pytest.raises(TypeError, match="stream=True does not support"):
+                    load(str(path), stream=True, **option)
+        with pytest.raises(TypeError, match="memo"):
+            dataconf.load(str(path), Routes, stream=True, memo=dataconf.DecodeMemo())
+
+    def test_errors(self) -> None:
+        with pytest.raises(UnexpectedKeysException):
+            loads("path: /\nbackends: []\nunknown: {a: 1}", Route)
+
+        assert loads(
+            "path: /\nbackends: []\nunknown: {a: &x one}\ntags: [*x]",
+            Route,
+            ignore_unexpected=True,
+        ) == Route(path="/", backends=[], tags=("one",))
+
+        with pytest.raises(MalformedConfigException):
+            loads("backends: []", Route)
+
+        with pytest.raises(TypeConfigException) as e:
+            loads("path: /\nbackends: [{host: a, port: x}]", Route)
+        assert e.value.args[0] == (
+            "expected type <class 'int'> at .backends[].port, got <class 'str'>"
+        )
+        assert type(e.value.args[0]) is str
+
+        with pytest.raises(TypeConfigException):
+            loads("", Route)
@@ -0,0 +1,130 @@
+from dataclasses import dataclass
+import os
+from threading import Event
+import time
+
+import dataconf
+from dataconf import multi
+from dataconf.watcher import Watcher
+from pyhocon import ConfigFactory
+
+
+@dataclass
+class A:
+    name: str
+    port: int
+    replicas: int = 1
+    region: str = "eu"
+
+
+class TestWatcher:
+    def test_poll(self, tmp_path, config_server, monkeypatch) -> None:
+        path = tmp_path / "a.hocon"
+        path.write_text("name = a, port = 80")
+        os.utime(path, ns=(0, 0))
+        config_server.documents["/b.yaml"] = (b"replicas: 2", '"v1"', None)
+        chain = (
+            multi.string("region = us")
+            .file(str(path))
+            .url(config_server.url_for("/b.yaml"))
+        )
+
+        received = []
+        watcher = Watcher(chain, A, received.append)
+        assert watcher.current == A(name="a", port=80, replicas=2, region="us")
+
+        parsed = []
+        parse_string = ConfigFactory.parse_string.__func__
+
+        def record(cls, content, *args, **kwargs):
+            parsed.append(content)
+            return parse_string(cls, content, *args, **kwargs)
+
+        monkeypatch.setattr(ConfigFactory, "parse_string", classmethod(record))
+
+        # nothing changed, the url is revalidated and nothing is parsed
+        assert not watcher.poll()
+        assert parsed == []
+        assert config_server.requests[-1] == ("/b.yaml", 304)
+
+        path.write_text("name = a, port = 81")
+        os.utime(path, ns=(1, 1))
+        assert watcher.poll()
+        assert parsed == ["name = a, port = 81"]
+        assert received == [A(name="a", port=81, replicas=2, region="us")]
+
+        # touched without changes, parsed again but not decoded
+        os.utime(path, ns=(2, 2))
+        assert not watcher.poll()
+        assert parsed == ["name = a, port = 81"] * 2
+
+        config_server.documents["/b.yaml"] = (b"replicas: 3", '"v2"', None)
+        assert watcher.poll()
+        assert parsed == ["name = a, port = 81"] * 2
+        assert watcher.current == A(name="a", port=81, replicas=3, region="us")
+        assert received[-1] is watcher.current
+
+    def test_missing_files(self, tmp_path) -> None:
+        base = tmp_path / "a.hocon"
+        base.write_text("name = a, port = 80")
+        override = tmp_path / "override.yaml"
+        chain = multi.file(str(base)).file(str(override), allow_missing=True)
+
+        watcher = Watcher(chain, A, lambda conf: None)
+        assert watcher.current == A(name="a", port=80)
+        assert not watcher.poll()
+
+        # files allowed to be missing are picked up once they appear
+        override.write_text("port: 81")
+        assert watcher.poll()
+        assert watcher.current == A(name="a", port=81)
+
+        override.unlink()
+        assert watcher.poll()
+        assert watcher.current == A(name="a", port=80)
+
+    def test_watch(self, tmp_path) -> None:
+        path = tmp_path / "a.hocon"
+        path.write_text("name = a, port = 80")
+        os.utime(path, ns=(0, 0))
+
+        changed = Event()
+        errors = []
+        received = []
+
+        def callback(conf: A) -> None:
+            received.append(conf)
+            changed.set()
+
+        with dataconf.watch(
+            multi.file(str(path)), A, callback, interval=0.01, on_error=errors.append
+        ) as watcher:
+            assert watcher.current == A(name="a", port=80)
+
+            path.write_text("name = a, port = oops")
+            os.utime(path, ns=(1, 1))
+            assert not changed.wait(0.2)
+            assert errors
+            assert watcher.current == A(name="a", port=80)
+
+            path.write_text("name = a, port = 81")
+            os.utime(path, ns=(2, 2))
+            assert changed.wait(5)
+
+        assert received == [A(name="a", port=81)]
+        assert watcher.current == A(name="a", port=81)
+
+    def test_logged_errors(self, tmp_path, caplog) -> None:
+        path = tmp_path / "a.hocon"
+        path.write_text("name = a, port = 80")
+        os.utime(path, ns=(0, 0))
+
+        with dataconf.watch(multi.file(str(path)), A, lambda conf: None, interval=0.01):
+            path.write_text("name = a, port = oops")
+            os.utime(path, ns=(1, 1))
+            deadline = time.monotonic() + 5
+            while not caplog.records and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        assert caplog.records[0].name == "dataconf.watcher"
+        assert caplog.records[0].exc_info is not None